@@ -0,0 +1,265 @@
+__author__ = "Hanno Postl"
+__version__ = "1.3"
+__status__ = "Finished"
+
+import csv
+import logging
+import os
+import re
+import shlex
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Iterable, List, NamedTuple
+
+from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+# Characters allowed in a group name; empty roster cells end up as "None" or "nan" in the group list
+GROUP_NAME = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]*")
+EMPTY_CELLS = {"", "None", "nan"}
+
+
+class Account(NamedTuple):
+    """A Linux account that should be created by one of the generated scripts."""
+    username: str
+    password: str
+    home: str
+    comment: str
+    groups: str
+
+
+def add_script_lines(accounts: Iterable[Account]) -> List[str]:
+    """
+    Build the lines of the add script (without shebang) for the given accounts.
+
+    Parameters:
+    accounts (Iterable[Account]): The accounts to create.
+
+    Returns:
+    List[str]: A useradd and a chpasswd line per account.
+
+    >>> add_script_lines([Account("kaa", "pw", "/home/kaa", "1A", "cdrom")])
+    ["useradd -m -d /home/kaa -s /bin/bash -c '1A' -G cdrom kaa", "echo 'kaa:pw' | chpasswd"]
+    """
+    lines: List[str] = []
+    for account in accounts:
+        groups = ",".join(group_names(account))
+        lines.append(f"useradd -m -d {account.home} -s /bin/bash -c '{account.comment}' "
+                     + (f"-G {groups} " if groups else "") + account.username)
+        lines.append(f"echo '{account.username}:{account.password}' | chpasswd")
+    return lines
+
+
+def group_names(account: Account) -> List[str]:
+    """
+    Split the supplementary groups of an account, skipping empty cells and invalid names.
+
+    Parameters:
+    account (Account): The account.
+
+    Returns:
+    List[str]: The valid group names in order.
+
+    >>> group_names(Account("kaa", "pw", "/home/kaa", "1A", "None,cdrom,,nan"))
+    ['cdrom']
+    """
+    names: List[str] = []
+    for group in account.groups.split(","):
+        if group in EMPTY_CELLS:
+            continue
+        if GROUP_NAME.fullmatch(group):
+            names.append(group)
+        else:
+            logger.warning(f"Skipped invalid group name {group!r} of user {account.username}.")
+    return names
+
+
+def del_script_lines(accounts: Iterable[Account]) -> List[str]:
+    """
+    Build the lines of the delete script (without shebang) for the given accounts.
+
+    Parameters:
+    accounts (Iterable[Account]): The accounts to delete.
+
+    Returns:
+    List[str]: A userdel line per account.
+    """
+    return [f"userdel -r {account.username}" for account in accounts]
+
+
+def credential_records(accounts: Iterable[Account]) -> List[Dict[str, str]]:
+    """
+    Build the credential records handed out to the users.
+
+    Parameters:
+    accounts (Iterable[Account]): The created accounts.
+
+    Returns:
+    List[Dict[str, str]]: One record with Username, Password and Home per account.
+    """
+    return [{"Username": account.username, "Password": account.password, "Home": account.home}
+            for account in accounts]
+
+
+def newusers_lines(accounts: Iterable[Account]) -> List[str]:
+    """
+    Build a newusers(8) batch file that creates all accounts in a single process.
+
+    UID and GID are left empty, so newusers picks the next free UID and creates a
+    group named like the user, just like useradd does.
+
+    Parameters:
+    accounts (Iterable[Account]): The accounts to create.
+
+    Returns:
+    List[str]: One passwd-style line per account.
+
+    >>> newusers_lines([Account("kaa", "pw", "/home/kaa", "1A", "cdrom")])
+    ['kaa:pw:::1A:/home/kaa:/bin/bash']
+    """
+    return [f"{account.username}:{account.password}:::{account.comment}:{account.home}:/bin/bash"
+            for account in accounts]
+
+
+def chpasswd_lines(accounts: Iterable[Account]) -> List[str]:
+    """
+    Build a chpasswd(8) input file that sets the passwords of all accounts in a single process.
+
+    Parameters:
+    accounts (Iterable[Account]): The accounts.
+
+    Returns:
+    List[str]: One username:password line per account.
+    """
+    return [f"{account.username}:{account.password}" for account in accounts]
+
+
+def batch_script_lines(accounts: Iterable[Account], newusers_file: str) -> List[str]:
+    """
+    Build the lines of a script that applies a newusers batch file.
+
+    All accounts are created by one newusers call. Supplementary groups are set with one
+    gpasswd call per group (keeping the current members) instead of one call per user.
+    Setting ROOT in the environment makes the script read the group file below that directory.
+
+    Parameters:
+    accounts (Iterable[Account]): The accounts in the batch file.
+    newusers_file (str): File name of the batch file, relative to the script.
+
+    Returns:
+    List[str]: The script lines (without shebang).
+
+    >>> lines = batch_script_lines([Account("kaa", "pw", "/home/kaa", "1A", "None,cdrom")], "user_add.newusers")
+    >>> for line in lines[3:]:
+    ...     print(line)
+    grep -q '^cdrom:' "${ROOT:-}/etc/group" || groupadd cdrom
+    members=$(grep '^cdrom:' "${ROOT:-}/etc/group" | cut -d: -f4)
+    gpasswd -M "${members:+$members,}kaa" cdrom
+    """
+    accounts = list(accounts)
+    members: Dict[str, List[str]] = {}
+    for account in accounts:
+        for group in group_names(account):
+            members.setdefault(group, []).append(account.username)
+
+    lines: List[str] = ["set -e"]
+    for parent in sorted({os.path.dirname(account.home) for account in accounts}):
+        lines.append(f'mkdir -p "${{ROOT:-}}{parent}"')
+    lines.append(f'newusers "$(dirname "$0")/{newusers_file}"')
+    for group, usernames in members.items():
+        pattern, quoted = shlex.quote("^" + group.replace(".", "\\.") + ":"), shlex.quote(group)
+        lines.append(f'grep -q {pattern} "${{ROOT:-}}/etc/group" || groupadd {quoted}')
+        lines.append(f'members=$(grep {pattern} "${{ROOT:-}}/etc/group" | cut -d: -f4)')
+        lines.append(f'gpasswd -M "${{members:+$members,}}{",".join(usernames)}" {quoted}')
+    return lines
+
+
+def write_batch(directory: str, name: str, accounts: List[Account]) -> None:
+    """
+    Write the batch backend files <name>.newusers, <name>.chpasswd and <name>_batch.sh.
+
+    <name>_batch.sh creates all accounts with newusers; <name>.chpasswd can be used to
+    (re)set all passwords at once with "chpasswd < <name>.chpasswd".
+
+    Parameters:
+    directory (str): Output directory.
+    name (str): Base name of the files, e.g. user_add.
+    accounts (List[Account]): The accounts to create.
+    """
+    write_lines(os.path.join(directory, f"{name}.newusers"), newusers_lines(accounts))
+    write_lines(os.path.join(directory, f"{name}.chpasswd"), chpasswd_lines(accounts))
+    write_script(os.path.join(directory, f"{name}_batch.sh"), batch_script_lines(accounts, f"{name}.newusers"))
+
+
+def write_lines(path: str, lines: Iterable[str]) -> None:
+    """
+    Write the given lines to a file that only the owner may read (it contains passwords).
+
+    Parameters:
+    path (str): Path of the file.
+    lines (Iterable[str]): The lines.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as file:
+        file.writelines(f"{line}\n" for line in lines)
+
+
+def write_script(path: str, lines: Iterable[str]) -> None:
+    """
+    Write a bash script consisting of the given lines.
+
+    Parameters:
+    path (str): Path of the script.
+    lines (Iterable[str]): The script lines (without shebang).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as script:
+        script.write("#!/bin/bash\n")
+        script.writelines(f"{line}\n" for line in lines)
+
+
+def write_records(path: str, records: List[Dict[str, str]]) -> None:
+    """
+    Write records as CSV or, if the path ends in .xlsx, as Excel file.
+
+    Parameters:
+    path (str): Path of the output file.
+    records (List[Dict[str, str]]): The records; the keys of the first record are the header.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    header = list(records[0].keys()) if records else []
+    if path.lower().endswith(".xlsx"):
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(header)
+        for record in records:
+            sheet.append([record[key] for key in header])
+        workbook.save(path)
+    else:
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=header, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def configure_logging(log_file: str, verbose: bool = False, quiet: bool = False) -> None:
+    """
+    Log to a rotating log file and to the console.
+
+    Parameters:
+    log_file (str): Path of the log file.
+    verbose (bool): Log debug messages.
+    quiet (bool): Only log warnings and errors.
+    """
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO)
+
+    handler = RotatingFileHandler(log_file, maxBytes=10000, backupCount=5)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    root.addHandler(handler)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    root.addHandler(console_handler)
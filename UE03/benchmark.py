@@ -0,0 +1,237 @@
+__author__ = "Hanno Postl"
+__version__ = "1.1"
+__status__ = "Finished"
+
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from openpyxl import Workbook, load_workbook
+
+from accounts import add_script_lines, write_batch, write_script
+from create_user import build_user_accounts
+
+READER_COLUMNS: List[str] = ["lastname", "group", "class"]
+
+# Each approach runs in a fresh interpreter so startup time and peak RSS are measured separately
+READERS: Dict[str, str] = {
+    "pandas": "import pandas as pd\n"
+              "n = sum(1 for _ in pd.read_excel(path).iterrows())",
+    "pandas-usecols": "import pandas as pd\n"
+                      "n = sum(1 for _ in pd.read_excel(path, usecols=columns).itertuples(index=False))",
+    "stream-xlsx": "from roster_reader import read_rows\n"
+                   "n = sum(1 for _ in read_rows(path, columns))",
+    "stream-csv": "from roster_reader import read_rows\n"
+                  "n = sum(1 for _ in read_rows(csv_path, columns))",
+}
+
+# Stand-ins for the shadow tools that work on $ROOT/etc instead of /etc. Like the real
+# tools they are separate processes that rewrite the account files on every call, so the
+# harness measures the cost of the process spawns without touching the system.
+SHIMS: Dict[str, str] = {
+    "useradd": """#!/bin/sh
+while [ $# -gt 1 ]; do
+    case "$1" in
+        -d) home="$2"; shift ;;
+        -c) comment="$2"; shift ;;
+        -G) groups="$2"; shift ;;
+    esac
+    shift
+done
+uid=$(($(wc -l < "$ROOT/etc/passwd") + 1000))
+{ cat "$ROOT/etc/passwd"; echo "$1:x:$uid:$uid:$comment:$home:/bin/bash"; } > "$ROOT/etc/passwd.new"
+mv "$ROOT/etc/passwd.new" "$ROOT/etc/passwd"
+{ cat "$ROOT/etc/shadow"; echo "$1:!:20000:0:99999:7:::"; } > "$ROOT/etc/shadow.new"
+mv "$ROOT/etc/shadow.new" "$ROOT/etc/shadow"
+awk -F: -v OFS=: -v user="$1" -v groups=",$groups," \
+    'index(groups, "," $1 ",") { $4 = ($4 == "" ? user : $4 "," user) } { print }' \
+    "$ROOT/etc/group" > "$ROOT/etc/group.new"
+mv "$ROOT/etc/group.new" "$ROOT/etc/group"
+mkdir -p "$ROOT$home"
+""",
+    "chpasswd": """#!/bin/sh
+awk -F: -v OFS=: 'NR == FNR { split($0, kv, ":"); pw[kv[1]] = "hash-" kv[2]; next }
+    ($1 in pw) { $2 = pw[$1] } { print }' - "$ROOT/etc/shadow" > "$ROOT/etc/shadow.new"
+mv "$ROOT/etc/shadow.new" "$ROOT/etc/shadow"
+""",
+    "newusers": """#!/bin/sh
+awk -F: -v root="$ROOT" -v base="$(wc -l < "$ROOT/etc/passwd")" '{
+    uid = base + NR + 1000
+    print $1 ":x:" uid ":" uid ":" $5 ":" $6 ":" $7 >> (root "/etc/passwd")
+    print $1 ":hash-" $2 ":20000:0:99999:7:::" >> (root "/etc/shadow")
+    print root $6
+}' "$1" | xargs mkdir -p
+""",
+    "groupadd": """#!/bin/sh
+echo "$1:x:$(($(wc -l < "$ROOT/etc/group") + 2000)):" >> "$ROOT/etc/group"
+""",
+    "gpasswd": """#!/bin/sh
+awk -F: -v OFS=: -v group="$3" -v members="$2" '$1 == group { $4 = members } { print }' \
+    "$ROOT/etc/group" > "$ROOT/etc/group.new"
+mv "$ROOT/etc/group.new" "$ROOT/etc/group"
+""",
+}
+
+
+def scale_roster(source: str, rows: int, directory: str) -> tuple[str, str]:
+    """
+    Write a copy of the roster with the given number of rows as .xlsx and .csv.
+
+    Parameters:
+    source (str): Path to the original roster (e.g. Namen.xlsx).
+    rows (int): Number of data rows of the scaled roster.
+    directory (str): Directory for the generated files.
+
+    Returns:
+    tuple[str, str]: Paths to the scaled .xlsx and .csv files.
+    """
+    workbook = load_workbook(source, read_only=True)
+    header, *data = list(workbook.active.iter_rows(values_only=True))
+    workbook.close()
+
+    xlsx_path = os.path.join(directory, f"roster_{rows}.xlsx")
+    csv_path = os.path.join(directory, f"roster_{rows}.csv")
+    out = Workbook(write_only=True)
+    sheet = out.create_sheet()
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        sheet.append(header)
+        writer.writerow(header)
+        for i in range(rows):
+            row = data[i % len(data)]
+            sheet.append(row)
+            writer.writerow(row)
+    out.save(xlsx_path)
+    return xlsx_path, csv_path
+
+
+def run_reader(name: str, xlsx_path: str, csv_path: str) -> Dict[str, float]:
+    """
+    Run one reader approach in a fresh child interpreter.
+
+    Parameters:
+    name (str): Key of the approach in READERS.
+    xlsx_path (str): Path to the scaled .xlsx roster.
+    csv_path (str): Path to the scaled .csv roster.
+
+    Returns:
+    Dict[str, float]: Wall time in seconds (including interpreter startup), peak RSS in MiB and rows read.
+    """
+    code = (f"path, csv_path, columns = {xlsx_path!r}, {csv_path!r}, {READER_COLUMNS!r}\n"
+            f"{READERS[name]}\n"
+            "import resource\n"
+            "print(n, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    elapsed = time.perf_counter() - start
+    rows, max_rss_kib = result.stdout.split()
+    return {"seconds": elapsed, "peak_rss_mib": int(max_rss_kib) / 1024, "rows": int(rows)}
+
+
+def benchmark_readers(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        xlsx_path, csv_path = scale_roster(args.source, args.rows, directory)
+        print(f"{'reader':<16}{'rows':>10}{'seconds':>10}{'peak RSS (MiB)':>16}")
+        for name in READERS:
+            result = run_reader(name, xlsx_path, csv_path)
+            print(f"{name:<16}{result['rows']:>10}{result['seconds']:>10.2f}{result['peak_rss_mib']:>16.1f}")
+
+
+def prepare_root(directory: str, groups: List[str]) -> str:
+    """
+    Create an empty passwd/shadow/group root below the given directory.
+
+    Parameters:
+    directory (str): Directory for the root.
+    groups (List[str]): Groups that already exist (useradd -G fails for unknown groups).
+
+    Returns:
+    str: Path of the root.
+    """
+    root = os.path.join(directory, "root")
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(os.path.join(root, "etc"))
+    with open(os.path.join(root, "etc", "passwd"), "w") as file:
+        file.write("root:x:0:0:root:/root:/bin/bash\n")
+    with open(os.path.join(root, "etc", "shadow"), "w") as file:
+        file.write("root:*:20000:0:99999:7:::\n")
+    with open(os.path.join(root, "etc", "group"), "w") as file:
+        file.write("root:x:0:\n")
+        file.writelines(f"{group}:x:{2000 + i}:\n" for i, group in enumerate(groups))
+    return root
+
+
+def run_script(script: str, root: str, bin_dir: str) -> float:
+    """
+    Run a generated script against the shims and the temporary root.
+
+    Parameters:
+    script (str): Path of the script.
+    root (str): The temporary root (see prepare_root).
+    bin_dir (str): Directory containing the shims.
+
+    Returns:
+    float: Wall time in seconds.
+    """
+    env = dict(os.environ, ROOT=root, PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    start = time.perf_counter()
+    subprocess.run(["bash", script], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def benchmark_provisioning(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        bin_dir = os.path.join(directory, "bin")
+        os.makedirs(bin_dir)
+        for name, code in SHIMS.items():
+            path = os.path.join(bin_dir, name)
+            with open(path, "w") as file:
+                file.write(code)
+            os.chmod(path, 0o755)
+
+        classes = ["1AI", "2BI", "3CN", "4AF", "5BM"]
+        rows = ((f"Schueler {i}", "student", classes[i % len(classes)]) for i in range(args.accounts))
+        accounts = build_user_accounts(rows)
+        out_dir = os.path.join(directory, "output")
+        write_script(os.path.join(out_dir, "user_add.sh"), add_script_lines(accounts))
+        write_batch(out_dir, "user_add", accounts)
+
+        results: Dict[str, float] = {}
+        created: Dict[str, List[str]] = {}
+        for backend, script in [("shell", "user_add.sh"), ("batch", "user_add_batch.sh")]:
+            root = prepare_root(directory, ["cdrom", "plugdev", "sambashare", "student"] + classes)
+            results[backend] = run_script(os.path.join(out_dir, script), root, bin_dir)
+            with open(os.path.join(root, "etc", "passwd")) as passwd, open(os.path.join(root, "etc", "group")) as group:
+                created[backend] = sorted(line.split(":", 1)[0] for line in passwd) + group.readlines()
+
+        if created["shell"] != created["batch"]:
+            print("Warning: the backends created different accounts", file=sys.stderr)
+        print(f"{'backend':<10}{'accounts':>10}{'seconds':>10}")
+        for backend, seconds in results.items():
+            print(f"{backend:<10}{len(accounts):>10}{seconds:>10.2f}")
+        print(f"Speedup: {results['shell'] / results['batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the UE03 account scripts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reader_parser = subparsers.add_parser("reader", help="Compare roster readers (time and peak RSS)")
+    reader_parser.add_argument("-s", "--source", default="Namen.xlsx", help="Roster to scale up")
+    reader_parser.add_argument("-n", "--rows", type=int, default=100_000, help="Number of rows of the scaled roster")
+    reader_parser.set_defaults(func=benchmark_readers)
+
+    provision_parser = subparsers.add_parser("provision",
+                                             help="Dry run of the shell and batch backends against a temporary root")
+    provision_parser.add_argument("-n", "--accounts", type=int, default=2000, help="Number of generated accounts")
+    provision_parser.set_defaults(func=benchmark_provisioning)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -1,37 +1,24 @@
 __author__ = "Hanno Postl"
-__version__ = "1.2"
+__version__ = "2.0"
 __status__ = "Finished"
 
-import pandas as pd
+import csv
 import unicodedata
 import random
-import os
 import logging
 import argparse
-from logging.handlers import RotatingFileHandler
-from typing import List, Dict
+from typing import Any, List, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from accounts import Account, add_script_lines, configure_logging, credential_records, del_script_lines, write_batch, write_records, write_script
+from roster_reader import MissingColumnError, read_rows
 
-# Argument parser setup
-parser = argparse.ArgumentParser(description="Create class users from an Excel file.")
-parser.add_argument("input_file", help="Path to the input Excel file")
-parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
-parser.add_argument("-q", "--quiet", action="store_true", help="Enable quiet logging")
-args = parser.parse_args()
+logger = logging.getLogger(__name__)
 
-# Logging configuration
-log_file = "./output/create_class.log"
-os.makedirs("./output", exist_ok=True)
-
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO)
-
-handler = RotatingFileHandler(log_file, maxBytes=10000, backupCount=5)
-handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(handler)
-
-consoleHandler = logging.StreamHandler()
-consoleHandler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(consoleHandler)
+# Columns of the room list that are needed to create a class user
+CLASS_COLUMNS: List[str] = ["Klasse", "Raum Nr.", "KV"]
+GROUPS: str = "cdrom,plugdev,sambashare"
+EXTRA_USERS: List[str] = ["lehrer", "seminar"]
+# Columns of class_state.csv, the state that --diff compares against
+STATE_COLUMNS: List[str] = ["Username", "Password", "Home", "Room", "Advisor"]
 
 def normalize_username(name: str) -> str:
     """
@@ -79,60 +66,205 @@ def generate_random_password(length: int = 12) -> str:
     chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!%&(),._-=^#"
     return ''.join(random.choice(chars) for _ in range(length))
 
-# Read class data from the Excel file
-try:
-    classData: pd.DataFrame = pd.read_excel(args.input_file)
-except FileNotFoundError:
-    logger.error(f"File not found: {args.input_file}")
-    exit(1)
+class ClassDiff(NamedTuple):
+    """Changes between the previous class_state.csv and the current room list."""
+    added: List[Account]
+    removed: List[str]
+    modified: List[Tuple[str, str, str]]
+    records: List[Dict[str, str]]
+
+def _cell_text(value: Any) -> str:
+    """Text of a cell, whole numbers without decimal places (165.0 -> '165')."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return "" if value is None else str(value)
+
+def _class_rows(rows: Iterable[Tuple[Any, Any, Any]]) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield (username, class name, room number, advisor) for every row with a class name."""
+    for klasse, raum, kv in (x for x in rows if x[0] is not None):
+        class_name: str = _cell_text(klasse)
+        yield f"k{normalize_username(class_name)}", class_name, _cell_text(raum), _cell_text(kv)
+
+def load_class_state(path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Load the records of a previously written class_state.csv, keyed by username.
+
+    Parameters:
+    path (str): Path of the previous class_state.csv.
+
+    Returns:
+    Dict[str, Dict[str, str]]: The record (Username, Password, Home, Room, Advisor) per username.
 
-# Prepare script contents
-add_script_path: str = "./output/class_add.sh"
-del_script_path: str = "./output/class_del.sh"
-csv_path: str = "./output/class.csv"
+    Raises:
+    ValueError: If the file lacks one of the state columns (e.g. a class.csv with credentials only).
+    """
+    with open(path, "r", newline="") as file:
+        reader = csv.DictReader(file)
+        missing = [column for column in STATE_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path} is not a class state, missing columns: {', '.join(missing)}")
+        return {record["Username"]: record for record in reader}
 
-with open(add_script_path, "w") as add_script, open(del_script_path, "w") as del_script:
-    add_script.write("#!/bin/bash\n")
-    del_script.write("#!/bin/bash\n")
+def diff_classes(rows: Iterable[Tuple[Any, Any, Any]], previous: Dict[str, Dict[str, str]]) -> ClassDiff:
+    """
+    Compare the room list with the previous state.
 
-    csv_data: List[Dict[str, str]] = []
-    for _, row in (x for x in classData.iterrows() if not pd.isnull(x[1]["Klasse"])):
-        class_name: str = str(row["Klasse"])
-        room_number: str = str(row["Raum Nr."])
-        advisor: str = str(row["KV"])
+    Accounts that already exist keep their credentials. Only new accounts get passwords,
+    so the work and the change set grow with the number of changes. Comparing against an
+    empty state yields all accounts as added.
 
-        username: str = f"k{normalize_username(class_name)}"
-        password: str = generate_password(class_name, room_number, advisor)
+    Parameters:
+    rows (Iterable[Tuple[Any, Any, Any]]): (Klasse, Raum Nr., KV) per class, e.g. from read_rows.
+    previous (Dict[str, Dict[str, str]]): The previous state, see load_class_state.
 
-        homeDir: str = f"/home/klassen/{username}"
-        groups: str = "cdrom,plugdev,sambashare"
+    Returns:
+    ClassDiff: Added accounts, removed usernames, (username, room, advisor) of modified
+               accounts and the records of the new state.
 
-        add_script.write(
-            f"useradd -m -d {homeDir} -s /bin/bash -c '{class_name}' -G {groups} {username}\n"
-            f"echo '{username}:{password}' | chpasswd\n"
-        )
-        del_script.write(f"userdel -r {username}\n")
+    >>> old = diff_classes([("1AM", 165, "FUA"), ("1BM", 365, "STW")], {})
+    >>> state = {record["Username"]: record for record in old.records}
+    >>> new = diff_classes([("1AM", 165.0, "FUA"), ("1BM", 366, "STW"), ("1CM", 354, "KOM")], state)
+    >>> [account.username for account in new.added], new.removed, new.modified
+    (['k1cm'], [], [('k1bm', '366', 'STW')])
+    >>> new.records[1]["Password"] == state["k1bm"]["Password"]
+    True
+    """
+    added: List[Account] = []
+    modified: List[Tuple[str, str, str]] = []
+    records: List[Dict[str, str]] = []
+    current = set()
 
-        csv_data.append({"Username": username, "Password": password, "Home": homeDir})
+    def keep_or_add(username: str, class_name: str, room_number: str, advisor: str, home: str,
+                    password) -> Optional[Account]:
+        current.add(username)
+        old = previous.get(username)
+        if old is None:
+            account = Account(username, password(), home, class_name, GROUPS)
+            added.append(account)
+            records.append({"Username": username, "Password": account.password, "Home": home,
+                            "Room": room_number, "Advisor": advisor})
+            return account
+        if (old["Room"], old["Advisor"]) != (room_number, advisor):
+            modified.append((username, room_number, advisor))
+        records.append({"Username": username, "Password": old["Password"], "Home": old["Home"],
+                        "Room": room_number, "Advisor": advisor})
+        return None
 
-        logger.debug(f"Created user {username} with password {password} and home directory {homeDir} for class {class_name} in room {room_number} with advisor {advisor}.")
+    for username, class_name, room_number, advisor in _class_rows(rows):
+        account = keep_or_add(username, class_name, room_number, advisor, f"/home/klassen/{username}",
+                              lambda: generate_password(class_name, room_number, advisor))
+        if account:
+            logger.debug(f"Created user {username} with password {account.password} and home directory {account.home} for class {class_name} in room {room_number} with advisor {advisor}.")
 
     # Add additional users
-    for user in ["lehrer", "seminar"]:
-        username: str = user
-        password: str = generate_random_password()
-        homeDir: str = f"/home/lehrer/{username}"
+    for user in EXTRA_USERS:
+        keep_or_add(user, user, "", "", f"/home/lehrer/{user}", generate_random_password)
+
+    removed = [username for username in previous if username not in current]
+    return ClassDiff(added, removed, modified, records)
+
+def build_class_accounts(rows: Iterable[Tuple[Any, Any, Any]]) -> List[Account]:
+    """
+    Create one account per class plus the additional users lehrer and seminar.
+
+    Parameters:
+    rows (Iterable[Tuple[Any, Any, Any]]): (Klasse, Raum Nr., KV) per class, e.g. from read_rows.
+                                           Rows without a class name are skipped.
+
+    Returns:
+    List[Account]: The class accounts in input order, followed by lehrer and seminar.
+    """
+    return diff_classes(rows, {}).added
+
+def modify_script_lines(modified: Iterable[Tuple[str, str, str]]) -> List[str]:
+    """
+    Build the lines of the modify script that stores changed rooms and advisors in the GECOS field.
+
+    Parameters:
+    modified (Iterable[Tuple[str, str, str]]): (username, room number, advisor) per changed account.
+
+    Returns:
+    List[str]: A chfn line per account.
+    """
+    return [f"chfn -r '{room_number}' -o '{advisor}' {username}" for username, room_number, advisor in modified]
+
+def create_classes(rows: Iterable[Tuple[Any, Any, Any]]) -> Tuple[List[str], List[str], List[Dict[str, str]]]:
+    """
+    Generate the add and delete script lines and the credential records for the given classes.
+
+    Parameters:
+    rows (Iterable[Tuple[Any, Any, Any]]): (Klasse, Raum Nr., KV) per class, e.g. from read_rows.
+
+    Returns:
+    Tuple[List[str], List[str], List[Dict[str, str]]]: The lines of class_add.sh and class_del.sh
+                                                      (without shebang) and the credential records.
+
+    >>> add_lines, del_lines, records = create_classes([("1AM", 165, "FUA"), (None, None, None)])
+    >>> del_lines
+    ['userdel -r k1am', 'userdel -r lehrer', 'userdel -r seminar']
+    >>> records[0]["Home"]
+    '/home/klassen/k1am'
+    """
+    accounts = build_class_accounts(rows)
+    return add_script_lines(accounts), del_script_lines(accounts), credential_records(accounts)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line interface: create class_add.sh, class_del.sh, class.csv and class_state.csv from a room list."""
+    parser = argparse.ArgumentParser(description="Create class users from an Excel or CSV file.")
+    parser.add_argument("input_file", help="Path to the input Excel (.xlsx) or CSV file")
+    parser.add_argument("-b", "--backend", choices=["shell", "batch"], default="shell",
+                        help="shell: one useradd/chpasswd per account; batch: additionally write newusers/chpasswd batch files")
+    parser.add_argument("-d", "--diff", metavar="PREVIOUS_STATE",
+                        help="Only write changes compared to a previous class_state.csv, existing credentials are kept")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Enable quiet logging")
+    args = parser.parse_args(argv)
+
+    configure_logging("./output/create_class.log", args.verbose, args.quiet)
+
+    # Stream class data from the Excel or CSV file
+    try:
+        classRows = read_rows(args.input_file, CLASS_COLUMNS)
+    except FileNotFoundError:
+        logger.error(f"File not found: {args.input_file}")
+        return 1
+    except MissingColumnError as error:
+        logger.error(str(error))
+        return 1
+
+    try:
+        previous = load_class_state(args.diff) if args.diff else {}
+    except FileNotFoundError:
+        logger.error(f"File not found: {args.diff}")
+        return 1
+    except ValueError as error:
+        logger.error(str(error))
+        return 1
 
-        add_script.write(
-            f"useradd -m -d {homeDir} -s /bin/bash -c '{username}' -G {groups} {username}\n"
-            f"echo '{username}:{password}' | chpasswd\n"
-        )
-        del_script.write(f"userdel -r {username}\n")
+    diff = diff_classes(classRows, previous)
 
-        csv_data.append({"Username": username, "Password": password, "Home": homeDir})
+    # Save scripts and CSV, the shell scripts are always written as fallback
+    write_script("./output/class_add.sh", add_script_lines(diff.added))
+    if args.diff:
+        write_script("./output/class_del.sh", [f"userdel -r {username}" for username in diff.removed])
+        write_script("./output/class_mod.sh", modify_script_lines(diff.modified))
+    else:
+        write_script("./output/class_del.sh", del_script_lines(diff.added))
+    if args.backend == "batch":
+        write_batch("./output", "class_add", diff.added)
+    # class.csv keeps the Username/Password/Home format, room and advisor go to the state for the next --diff
+    write_records("./output/class.csv", [{key: record[key] for key in ("Username", "Password", "Home")}
+                                         for record in diff.records])
+    write_records("./output/class_state.csv", diff.records)
 
-# Save CSV
-csv_df: pd.DataFrame = pd.DataFrame(csv_data)
-csv_df.to_csv(csv_path, index=False)
+    if args.diff:
+        logger.info(f"{len(diff.added)} added, {len(diff.removed)} removed and {len(diff.modified)} modified accounts.")
+        logger.info("Scripts class_add.sh, class_del.sh, class_mod.sh, class.csv and class_state.csv successfully created.")
+    else:
+        logger.info("Scripts class_add.sh, class_del.sh, class.csv and class_state.csv successfully created.")
+    if args.backend == "batch":
+        logger.info("Batch files class_add.newusers, class_add.chpasswd and class_add_batch.sh successfully created.")
+    return 0
 
-logger.info("Scripts class_add.sh, class_del.sh, and class.csv successfully created.")
\ No newline at end of file
+if __name__ == "__main__":
+    exit(main())
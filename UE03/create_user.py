@@ -1,38 +1,23 @@
 __author__ = "Hanno Postl"
-__version__ = "1.3"
+__version__ = "2.1"
 __status__ = "Finished"
 
-import pandas as pd
 import unicodedata
 import random
-import os
 import logging
 import argparse
-from logging.handlers import RotatingFileHandler
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from accounts import Account, add_script_lines, configure_logging, credential_records, write_batch, write_records, write_script
+from roster_reader import MissingColumnError, read_rows
+from username_registry import UsernameRegistry
 
-# Argument parser setup
-parser = argparse.ArgumentParser(description="Create user accounts from an Excel file.")
-parser.add_argument("input_file", help="Path to the input Excel file")
-parser.add_argument("-o", "--output", choices=["csv", "xlsx"], default="csv", help="Output format: csv or xlsx")
-parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
-parser.add_argument("-q", "--quiet", action="store_true", help="Enable quiet logging")
-args = parser.parse_args()
+logger = logging.getLogger(__name__)
 
-# Logging configuration
-log_file: str = "./output/create_user.log"
-os.makedirs("./output", exist_ok=True)
+# Columns of the roster that are needed to create a user
+USER_COLUMNS: List[str] = ["lastname", "group", "class"]
+# Columns that identify a person across imports if the roster has them
+IDENTITY_COLUMNS: List[str] = ["firstname", "id"]
 
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO)
-
-handler = RotatingFileHandler(log_file, maxBytes=10000, backupCount=5)
-handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(handler)
-
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(console_handler)
 
 def normalize_username(name: str) -> str:
     """
@@ -64,52 +49,148 @@ def generate_random_password(length: int = 12) -> str:
     chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!%&(),._-=^#"
     return ''.join(random.choice(chars) for _ in range(length))
 
-# Read user data from the Excel file
-try:
-    user_data: pd.DataFrame = pd.read_excel(args.input_file)
-except FileNotFoundError:
-    logger.error(f"File not found: {args.input_file}")
-    exit(1)
-
-# Prepare script contents
-add_script_path: str = "./output/user_add.sh"
-output_path: str = f"./output/user.{args.output}"
-
-usernames: Dict[str, int] = {}
-with open(add_script_path, "w") as add_script:
-    add_script.write("#!/bin/bash\n")
-
-    csv_data: List[Dict[str, str]] = []
-    for _, row in user_data.iterrows():
-        last_name: str = str(row["lastname"])
-        groups: str = str(row["group"]) + ",cdrom,plugdev,sambashare," + str(row["class"])
-        username: str = normalize_username(last_name)
-
-        # Handle duplicate usernames
-        if username in usernames:
-            count: int = usernames[username] + 1
-            usernames[username] = count
-            username = f"{username}{count}"
-        else:
-            usernames[username] = 0
+def person_identity(last_name: str, first_name: Any = None, person_id: Any = None, occurrence: int = 0) -> str:
+    """
+    Build the registry key of a person, see UsernameRegistry.allocate.
+
+    The roster id is used if there is one. Otherwise a person is identified by first and last
+    name and how often that name occurred before in the roster, so two people with the same
+    name are only told apart by their order. The class is not part of the key, it changes
+    every school year.
+
+    Parameters:
+    last_name (str): The last name.
+    first_name (Any): The first name, None if the roster has none.
+    person_id (Any): The roster id, None if the roster has none.
+    occurrence (int): Number of earlier rows with the same first and last name.
+
+    Returns:
+    str: The identity.
+
+    >>> person_identity("Huber", "Anna"), person_identity("Huber", "Anna", 4711)
+    ('Anna|Huber|0', 'id:4711')
+    """
+    if person_id is not None:
+        return f"id:{person_id}"
+    return f"{first_name or ''}|{last_name}|{occurrence}"
+
+def build_user_accounts(rows: Iterable[Tuple[Any, ...]],
+                        registry: Optional[UsernameRegistry] = None) -> List[Account]:
+    """
+    Create the accounts for the given roster rows.
+
+    Every row gets the username that was allocated for the same person before (see
+    person_identity), so importing a later roster against the same registry keeps the names
+    of returning users, even if their class changed.
+
+    Parameters:
+    rows (Iterable[Tuple[Any, ...]]): (lastname, group, class) per user, optionally followed by
+                                      firstname and id, e.g. from read_rows.
+    registry (Optional[UsernameRegistry]): Registry of taken usernames. Default is a new in-memory registry.
+
+    Returns:
+    List[Account]: One account per row, in roster order.
+    """
+    if registry is None:
+        registry = UsernameRegistry()
+
+    accounts: List[Account] = []
+    occurrences: Dict[Tuple[Any, str], int] = {}
+    for last_name, group, class_name, *person in rows:
+        last_name: str = str(last_name)
+        groups: str = str(group) + ",cdrom,plugdev,sambashare," + str(class_name)
+        first_name, person_id = (person + [None, None])[:2]
+        occurrence: int = occurrences.get((first_name, last_name), 0)
+        occurrences[(first_name, last_name)] = occurrence + 1
+        identity: str = person_identity(last_name, first_name, person_id, occurrence)
+        username: str = registry.allocate(normalize_username(last_name), identity)
 
         password: str = generate_random_password()
         home_dir: str = f"/home/{username}"
 
-        add_script.write(
-            f"useradd -m -d {home_dir} -s /bin/bash -c '{last_name}' -G {groups} {username}\n"
-            f"echo '{username}:{password}' | chpasswd\n"
-        )
-
-        csv_data.append({"Username": username, "Password": password, "Home": home_dir})
+        accounts.append(Account(username, password, home_dir, last_name, groups))
 
         logger.debug(f"Created user {username} with password {password} and home directory {home_dir} for last name {last_name}.")
+    return accounts
+
+def create_users(rows: Iterable[Tuple[Any, ...]],
+                 registry: Optional[UsernameRegistry] = None) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Generate the add script lines and the credential records for the given roster rows.
 
-# Save output
-csv_df: pd.DataFrame = pd.DataFrame(csv_data)
-if args.output == "csv":
-    csv_df.to_csv(output_path, index=False)
-else:
-    csv_df.to_excel(output_path, index=False)
+    Parameters:
+    rows (Iterable[Tuple[Any, ...]]): (lastname, group, class[, firstname, id]) per user, e.g. from read_rows.
+    registry (Optional[UsernameRegistry]): Registry of taken usernames. Default is a new in-memory registry.
 
-logger.info(f"Script user_add.sh and user.{args.output} successfully created.")
\ No newline at end of file
+    Returns:
+    Tuple[List[str], List[Dict[str, str]]]: The lines of user_add.sh (without shebang) and the credential records.
+
+    >>> lines, records = create_users([("Huber", "student", "1AI"), ("Huber", "student", "2AI")])
+    >>> [record["Username"] for record in records]
+    ['huber', 'huber1']
+    >>> registry = UsernameRegistry()
+    >>> [[record["Username"] for record in create_users([("Huber", "student", "1AI")] * 2, registry)[1]]
+    ...  for _ in range(2)]
+    [['huber', 'huber1'], ['huber', 'huber1']]
+    >>> next_year = [("Huber", "student", "2AI", "Anna"), ("Maier", "student", "1AI", "Eva")]
+    >>> registry = UsernameRegistry()
+    >>> _ = create_users([("Huber", "student", "1AI", "Anna")], registry)
+    >>> [record["Username"] for record in create_users(next_year, registry)[1]]
+    ['huber', 'maier']
+    >>> lines[0]
+    "useradd -m -d /home/huber -s /bin/bash -c 'Huber' -G student,cdrom,plugdev,sambashare,1AI huber"
+    """
+    accounts = build_user_accounts(rows, registry)
+    return add_script_lines(accounts), credential_records(accounts)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line interface: create user_add.sh and the credential file from a roster."""
+    parser = argparse.ArgumentParser(description="Create user accounts from an Excel or CSV file.")
+    parser.add_argument("input_file", help="Path to the input Excel (.xlsx) or CSV file")
+    parser.add_argument("-o", "--output", choices=["csv", "xlsx"], default="csv", help="Output format: csv or xlsx")
+    parser.add_argument("-r", "--registry", default="./output/usernames.db", help="Path to the persistent username registry")
+    parser.add_argument("-p", "--passwd", help="passwd-format file with existing system accounts to reserve")
+    parser.add_argument("-b", "--backend", choices=["shell", "batch"], default="shell",
+                        help="shell: one useradd/chpasswd per account; batch: additionally write newusers/chpasswd batch files")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Enable quiet logging")
+    args = parser.parse_args(argv)
+
+    configure_logging("./output/create_user.log", args.verbose, args.quiet)
+
+    # Stream user data from the Excel or CSV file
+    try:
+        user_rows = read_rows(args.input_file, USER_COLUMNS, optional=IDENTITY_COLUMNS)
+    except FileNotFoundError:
+        logger.error(f"File not found: {args.input_file}")
+        return 1
+    except MissingColumnError as error:
+        logger.error(str(error))
+        return 1
+
+    # Usernames already taken by earlier runs or by system accounts
+    with UsernameRegistry(args.registry) as registry:
+        if args.passwd:
+            try:
+                imported = registry.import_passwd(args.passwd)
+            except FileNotFoundError:
+                logger.error(f"File not found: {args.passwd}")
+                return 1
+            if imported is not None:
+                logger.info(f"Reserved {imported} existing accounts from {args.passwd}.")
+
+        accounts = build_user_accounts(user_rows, registry)
+
+        # Save output, the shell script is always written as fallback
+        write_script("./output/user_add.sh", add_script_lines(accounts))
+        if args.backend == "batch":
+            write_batch("./output", "user_add", accounts)
+        write_records(f"./output/user.{args.output}", credential_records(accounts))
+
+    logger.info(f"Script user_add.sh and user.{args.output} successfully created.")
+    if args.backend == "batch":
+        logger.info("Batch files user_add.newusers, user_add.chpasswd and user_add_batch.sh successfully created.")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
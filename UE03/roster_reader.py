@@ -0,0 +1,89 @@
+__author__ = "Hanno Postl"
+__version__ = "1.2"
+__status__ = "Finished"
+
+import csv
+import os
+import sys
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+
+class MissingColumnError(ValueError):
+    """A requested column is not in the header of the roster file."""
+
+
+def read_rows(path: str, columns: Sequence[str], sheet: Optional[str] = None,
+              optional: Sequence[str] = ()) -> Iterator[Tuple[Any, ...]]:
+    """
+    Stream the given columns of a roster file as plain tuples.
+
+    Excel files are opened in openpyxl's read-only mode and iterated row by row, so only the
+    requested cells are ever converted to Python objects. Files ending in .csv are read with
+    the csv module (delimiter ',' or ';' is detected from the header line). Empty cells are
+    returned as None, completely empty rows are skipped. Optional columns follow the required
+    ones in the tuples and are None in every row if the file does not have them.
+
+    Parameters:
+    path (str): Path to the .xlsx or .csv file.
+    columns (Sequence[str]): The header names of the columns to read, in the order of the tuples.
+    sheet (Optional[str]): Name of the worksheet to read. Default is the active (first) sheet.
+    optional (Sequence[str]): Header names of columns that may be missing. Default is none.
+
+    Returns:
+    Iterator[Tuple[Any, ...]]: One tuple per row with the values of the requested columns.
+
+    Raises:
+    FileNotFoundError: If the file does not exist.
+    MissingColumnError: If one of the requested columns is missing in the header.
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        file = open(path, "r", newline="", encoding="utf-8-sig")
+        try:
+            header_line = file.readline()
+            delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+            header = next(csv.reader([header_line], delimiter=delimiter))
+            indices = _column_indices(path, header, columns, optional)
+        except BaseException:
+            file.close()
+            raise
+        return _read_csv_rows(file, delimiter, indices)
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        indices = _column_indices(path, next(rows, ()), columns, optional)
+    except BaseException:
+        workbook.close()
+        raise
+    return _read_excel_rows(workbook, rows, indices)
+
+
+def _column_indices(path: str, header: Sequence[Any], columns: Sequence[str],
+                    optional: Sequence[str] = ()) -> List[int]:
+    names = [str(name).strip() if name is not None else None for name in header]
+    for column in columns:
+        if column not in names:
+            raise MissingColumnError(f"Column '{column}' not found in header of {path}")
+    # A missing optional column gets an index past every row, so the readers return None for it
+    return [names.index(column) if column in names else sys.maxsize for column in [*columns, *optional]]
+
+
+def _read_excel_rows(workbook, rows, indices: List[int]) -> Iterator[Tuple[Any, ...]]:
+    try:
+        for row in rows:
+            values = tuple(row[i] if i < len(row) else None for i in indices)
+            if any(value is not None for value in values):
+                yield values
+    finally:
+        workbook.close()
+
+
+def _read_csv_rows(file, delimiter: str, indices: List[int]) -> Iterator[Tuple[Any, ...]]:
+    with file:
+        for row in csv.reader(file, delimiter=delimiter):
+            values = tuple((row[i] or None) if i < len(row) else None for i in indices)
+            if any(value is not None for value in values):
+                yield values
@@ -0,0 +1,150 @@
+__author__ = "Hanno Postl"
+__version__ = "1.2"
+__status__ = "Finished"
+
+import os
+import sqlite3
+from typing import Optional
+
+
+class UsernameRegistry:
+    """
+    Persistent registry of all usernames that are already taken.
+
+    The registry is stored in an SQLite database and holds both the usernames generated by
+    previous runs and the existing system accounts (imported from a passwd-format file).
+    Every name is a primary key, so membership tests are index lookups. For every base name
+    the next free suffix is stored as well, which makes allocating a name O(1) amortized
+    instead of counting up from zero on every run. Names allocated for a person (an identity
+    such as a roster id, see create_user.person_identity) are remembered, so importing the same
+    people again hands out the same names instead of new suffixes. Used as a context manager, the registry is closed
+    on exit and pending reservations are only committed if no exception was raised.
+
+    >>> registry = UsernameRegistry(":memory:")
+    >>> registry.reserve("mueller1", "system")
+    True
+    >>> [registry.allocate("mueller") for _ in range(3)]
+    ['mueller', 'mueller2', 'mueller3']
+    >>> registry.is_taken("mueller2")
+    True
+    >>> registry.allocate("huber", "Anna|Huber|0"), registry.allocate("huber", "Eva|Huber|0")
+    ('huber', 'huber1')
+    >>> registry.allocate("huber", "Anna|Huber|0")
+    'huber'
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS usernames (name TEXT PRIMARY KEY, source TEXT NOT NULL) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS suffixes (base TEXT PRIMARY KEY, next INTEGER NOT NULL) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS people (identity TEXT PRIMARY KEY, name TEXT NOT NULL) WITHOUT ROWID;"
+        )
+
+    def __enter__(self) -> "UsernameRegistry":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self._connection.rollback()
+        self.close()
+
+    def is_taken(self, name: str) -> bool:
+        """
+        Check whether a username is already taken.
+
+        Parameters:
+        name (str): The username to check.
+
+        Returns:
+        bool: True if the username is registered.
+        """
+        return self._connection.execute("SELECT 1 FROM usernames WHERE name = ?", (name,)).fetchone() is not None
+
+    def reserve(self, name: str, source: str = "generated") -> bool:
+        """
+        Mark a username as taken.
+
+        Parameters:
+        name (str): The username to reserve.
+        source (str): Where the name comes from ("generated" or "system").
+
+        Returns:
+        bool: True if the name was free before, False if it was already taken.
+        """
+        cursor = self._connection.execute("INSERT OR IGNORE INTO usernames (name, source) VALUES (?, ?)",
+                                          (name, source))
+        return cursor.rowcount == 1
+
+    def allocate(self, base: str, identity: Optional[str] = None) -> str:
+        """
+        Allocate a free username for the given base name and reserve it.
+
+        The base name itself is used if it is free, otherwise the next free suffix is appended.
+        Suffixes that collide with existing accounts are skipped. If an identity is given and a
+        name was already allocated for it, that name is returned again.
+
+        Parameters:
+        base (str): The normalized base username.
+        identity (Optional[str]): Key of the person the name is for. Default is None (always allocate a new name).
+
+        Returns:
+        str: The allocated username.
+        """
+        if identity is not None:
+            row = self._connection.execute("SELECT name FROM people WHERE identity = ?", (identity,)).fetchone()
+            if row:
+                return row[0]
+            name = self._allocate(base)
+            self._connection.execute("INSERT INTO people (identity, name) VALUES (?, ?)", (identity, name))
+            return name
+        return self._allocate(base)
+
+    def _allocate(self, base: str) -> str:
+        if self.reserve(base):
+            return base
+
+        row = self._connection.execute("SELECT next FROM suffixes WHERE base = ?", (base,)).fetchone()
+        suffix: int = row[0] if row else 1
+        while not self.reserve(f"{base}{suffix}"):
+            suffix += 1
+        self._connection.execute("INSERT OR REPLACE INTO suffixes (base, next) VALUES (?, ?)", (base, suffix + 1))
+        return f"{base}{suffix}"
+
+    def import_passwd(self, path: str) -> Optional[int]:
+        """
+        Reserve all account names of a passwd-format file.
+
+        The file is only parsed again if its size or modification time changed since the last import.
+
+        Parameters:
+        path (str): Path to the passwd-format file.
+
+        Returns:
+        Optional[int]: The number of accounts read, or None if the file was already imported.
+        """
+        stat = os.stat(path)
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        key = f"passwd:{os.path.abspath(path)}"
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == signature:
+            return None
+
+        with open(path, "r") as file:
+            names = [(line.split(":", 1)[0], "system") for line in file if line.strip() and not line.startswith("#")]
+        self._connection.executemany("INSERT OR IGNORE INTO usernames (name, source) VALUES (?, ?)", names)
+        self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, signature))
+        self._connection.commit()
+        return len(names)
+
+    def commit(self) -> None:
+        """Write all reservations to the database."""
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Commit pending reservations and close the database."""
+        self._connection.commit()
+        self._connection.close()
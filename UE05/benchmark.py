@@ -0,0 +1,289 @@
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from queue import PriorityQueue
+from typing import Callable, Dict, List, Optional, Tuple
+
+from csr_graph import CSRGraph
+from graph import Graph, Edge
+from heuristics import Landmarks, euclidean_heuristic
+from path_cache import ShortestPathCache
+
+# A prepared search: (start index, goal index, stats) -> cost
+Search = Callable[[int, int, Dict[str, int]], float]
+
+
+def random_edges(vertex_count: int, edge_count: int, seed: int = 0) -> List[Tuple[int, int, float]]:
+    # Random spanning tree first so every query has a path, then random extra edges
+    rng = random.Random(seed)
+    edges = [(rng.randrange(v), v, rng.uniform(1, 100)) for v in range(1, vertex_count)]
+    for _ in range(edge_count - (vertex_count - 1)):
+        u, v = rng.randrange(vertex_count), rng.randrange(vertex_count)
+        if u != v:
+            edges.append((u, v, rng.uniform(1, 100)))
+    return edges
+
+
+def random_geometric_edges(vertex_count: int, edge_count: int,
+                           seed: int = 0) -> Tuple[List[Tuple[int, int, float]], Dict[int, Tuple[float, float]]]:
+    # Random points in the unit square on a grid of cells with about two points each, like a road network.
+    # A chain through the cells row by row (every other row backwards) keeps the graph connected, the other
+    # edges join points in the same or neighboring cells. Weights are at least the straight-line distance,
+    # so the euclidean heuristic stays admissible.
+    rng = random.Random(seed)
+    coordinates = {i: (rng.random(), rng.random()) for i in range(vertex_count)}
+    side = max(1, int(math.sqrt(vertex_count / 2)))
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, (x, y) in coordinates.items():
+        cells.setdefault((min(int(x * side), side - 1), min(int(y * side), side - 1)), []).append(i)
+
+    def weight(u: int, v: int) -> float:
+        return math.dist(coordinates[u], coordinates[v]) * rng.uniform(1, 1.5)
+
+    snake = sorted(coordinates, key=lambda i: (int(coordinates[i][1] * side),
+                                               coordinates[i][0] if int(coordinates[i][1] * side) % 2 == 0
+                                               else -coordinates[i][0]))
+    edges = [(u, v, weight(u, v)) for u, v in zip(snake, snake[1:])]
+    while len(edges) < edge_count:
+        u = rng.randrange(vertex_count)
+        x, y = coordinates[u]
+        cell = (min(int(x * side), side - 1) + rng.randint(-1, 1), min(int(y * side), side - 1) + rng.randint(-1, 1))
+        if cell in cells:
+            v = rng.choice(cells[cell])
+            if u != v:
+                edges.append((u, v, weight(u, v)))
+    return edges, coordinates
+
+
+def build_list_graph(vertex_count: int, edges: List[Tuple[int, int, float]]) -> Graph[int]:
+    graph: Graph[int] = Graph(list(range(vertex_count)))
+    for u, v, weight in edges:
+        graph.add_edge_by_indices(u, v, weight)
+    return graph
+
+
+def build_csr_graph(vertex_count: int, edges: List[Tuple[int, int, float]]) -> CSRGraph[int]:
+    return CSRGraph(list(range(vertex_count)), edges)
+
+
+def build_csr32_graph(vertex_count: int, edges: List[Tuple[int, int, float]]) -> CSRGraph[int]:
+    # Weights rounded to float32, 16 bytes per edge even for the random double weights used here
+    return CSRGraph(list(range(vertex_count)), edges, single_precision=True)
+
+
+BACKENDS = {
+    "list": build_list_graph,
+    "csr": build_csr_graph,
+    "csr32": build_csr32_graph,
+}
+
+
+def priority_queue_search(graph: Graph, start_index: int, goal_index: int,
+                          stats: Optional[Dict[str, int]] = None) -> Tuple[List[Edge], float]:
+    # The previous uniform_cost_search_by_index, kept as the baseline
+    pq = PriorityQueue()
+    pq.put((0, start_index, []))
+    visited = set()
+
+    while not pq.empty():
+        cost, current, path = pq.get()
+        if current in visited:
+            continue
+        visited.add(current)
+
+        if current == goal_index:
+            if stats is not None:
+                stats["settled"] = len(visited)
+            return path, cost
+
+        for edge in graph.edges_for_index(current):
+            if edge.v not in visited:
+                pq.put((cost + edge.weight, edge.v, path + [edge]))
+
+    return [], float('inf')
+
+
+def cell_by_cell_load(graph: Graph, lines: List[str]) -> None:
+    # The previous set_adjacency_matrix, kept as the baseline: add_edge for every non-empty cell
+    lines = [line.strip() for line in lines if line.strip()]
+    headers = lines[0].split(";")[1:]
+    graph._set_vertices(headers)
+    graph._edges = [[] for _ in headers]
+    for i, line in enumerate(lines[1:]):
+        for j, weight in enumerate(line.split(";")[1:]):
+            weight = weight.strip()
+            if weight:
+                graph.add_edge_by_indices(i, j, float(weight))
+
+
+def write_graph_files(vertex_count: int, edges: List[Tuple[int, int, float]], directory: str) -> Tuple[str, str]:
+    # The same graph as adjacency matrix and as edge list file (parallel edges keep the last weight)
+    matrix = [[""] * vertex_count for _ in range(vertex_count)]
+    for u, v, weight in edges:
+        matrix[u][v] = matrix[v][u] = f"{weight:.3f}"
+    matrix_file, edge_list_file = os.path.join(directory, "matrix.csv"), os.path.join(directory, "edges.csv")
+    with open(matrix_file, "w") as file:
+        file.write(";" + ";".join(map(str, range(vertex_count))) + "\n")
+        for u, row in enumerate(matrix):
+            file.write(f"{u};" + ";".join(row) + "\n")
+    with open(edge_list_file, "w") as file:
+        for u, row in enumerate(matrix):
+            file.writelines(f"{u};{v};{weight}\n" for v, weight in enumerate(row[u:], u) if weight)
+    return matrix_file, edge_list_file
+
+
+def benchmark_spanning_trees(graph: Graph, methods: List[str]) -> None:
+    print(f"{'spanning tree':<16}{'edges':>10}{'seconds':>10}{'weight':>14}")
+    for method in methods:
+        start = time.perf_counter()
+        tree, total = graph.minimum_spanning_tree(method)
+        seconds = time.perf_counter() - start
+        print(f"{method:<16}{len(tree):>10}{seconds:>10.2f}{total:>14.1f}")
+    start = time.perf_counter()
+    components = max(graph.connected_components(), default=-1) + 1
+    print(f"{'components':<16}{components:>10}{time.perf_counter() - start:>10.2f}")
+
+
+def benchmark_loading(vertex_count: int, edges: List[Tuple[int, int, float]], backend: str) -> None:
+    graph_class = Graph if backend == "list" else CSRGraph
+    with tempfile.TemporaryDirectory() as directory:
+        matrix_file, edge_list_file = write_graph_files(vertex_count, edges, directory)
+        loads = {
+            "matrix": lambda graph: graph.read_graph_from_adjacency_matrix_file(matrix_file, use_numpy=False),
+            "matrix-numpy": lambda graph: graph.read_graph_from_adjacency_matrix_file(matrix_file, use_numpy=True),
+            "edge-list": lambda graph: graph.read_graph_from_edge_list_file(edge_list_file),
+        }
+        if backend == "list":
+            loads = {"cell-by-cell": lambda graph: cell_by_cell_load(graph, open(matrix_file).readlines()), **loads}
+
+        print(f"{'load':<16}{'vertices':>10}{'edges':>10}{'seconds':>10}")
+        for name, load in loads.items():
+            graph = graph_class()
+            start = time.perf_counter()
+            load(graph)
+            seconds = time.perf_counter() - start
+            print(f"{name:<16}{graph.vertex_count:>10}{graph.edge_count:>10}{seconds:>10.2f}")
+
+
+SEARCH_NAMES = ["priority-queue", "heapq", "bidirectional", "astar-alt", "astar-euclid", "cached"]
+
+
+def prepare_searches(graph: Graph, names: List[str], landmarks: int,
+                     coordinates: Optional[Dict[int, Tuple[float, float]]],
+                     cache: Optional[ShortestPathCache] = None) -> Dict[str, Search]:
+    searches: Dict[str, Search] = {
+        "priority-queue": lambda s, t, stats: priority_queue_search(graph, s, t, stats)[1],
+        "heapq": lambda s, t, stats: graph.uniform_cost_search_by_index(s, t, stats)[2],
+        "bidirectional": lambda s, t, stats: graph.bidirectional_search_by_index(s, t, stats)[2],
+    }
+    if "astar-alt" in names:
+        start = time.perf_counter()
+        alt = Landmarks(graph, landmarks)
+        print(f"Precomputed {len(alt.landmarks)} landmarks in {time.perf_counter() - start:.2f} s")
+        searches["astar-alt"] = lambda s, t, stats: graph.astar_search_by_index(s, t, alt, stats)[2]
+    if "astar-euclid" in names:
+        if coordinates is None:
+            raise RuntimeError("astar-euclid needs --geometric")
+        euclid = euclidean_heuristic(graph, coordinates)
+        searches["astar-euclid"] = lambda s, t, stats: graph.astar_search_by_index(s, t, euclid, stats)[2]
+    if cache is not None:
+        searches["cached"] = lambda s, t, stats: cache.search_by_index(s, t)[2]
+    return {name: searches[name] for name in names}
+
+
+def benchmark_searches(searches: Dict[str, Search], queries: List[Tuple[int, int]]) -> None:
+    print(f"{'search':<16}{'queries':>10}{'seconds':>10}{'ms/query':>10}{'settled/query':>15}")
+    costs = {}
+    for name, search in searches.items():
+        settled = 0
+        costs[name] = []
+        start = time.perf_counter()
+        for s, t in queries:
+            stats: Dict[str, int] = {}
+            costs[name].append(search(s, t, stats))
+            settled += stats.get("settled", 0)
+        seconds = time.perf_counter() - start
+        print(f"{name:<16}{len(queries):>10}{seconds:>10.2f}{seconds / len(queries) * 1000:>10.2f}"
+              f"{settled / len(queries):>15.0f}")
+
+    names = list(searches)
+    for name in names[1:]:
+        if any(abs(a - b) > 1e-9 for a, b in zip(costs[names[0]], costs[name])):
+            print(f"Warning: {name} found different costs than {names[0]}")
+
+
+def benchmark_all_pairs(graph: Graph, methods: List[str]) -> None:
+    print(f"{'all pairs':<16}{'vertices':>10}{'seconds':>10}{'diameter':>10}")
+    for method in methods:
+        start = time.perf_counter()
+        dist, _ = graph.all_pairs_shortest_paths(method)
+        seconds = time.perf_counter() - start
+        print(f"{method:<16}{graph.vertex_count:>10}{seconds:>10.2f}{graph.diameter(dist):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the shortest path searches of UE05 on random graphs")
+    parser.add_argument("-n", "--vertices", type=int, default=100_000, help="number of vertices")
+    parser.add_argument("-m", "--edges", type=int, default=1_000_000, help="number of edges")
+    parser.add_argument("-q", "--queries", type=int, default=20, help="number of random start/goal pairs")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed for graph and queries")
+    parser.add_argument("--searches", nargs="+", choices=SEARCH_NAMES, default=["priority-queue", "heapq"],
+                        help="searches to compare")
+    parser.add_argument("-g", "--geometric", action="store_true", help="random points with straight-line weights "
+                        "(needed for astar-euclid) instead of uniformly random edges")
+    parser.add_argument("--sources", type=int, help="draw the query starts from this many random vertices, "
+                        "so repeated sources can hit the cache")
+    parser.add_argument("--cache-mib", type=float, default=64, help="memory budget of the cached search in MiB")
+    parser.add_argument("-l", "--landmarks", type=int, default=8, help="number of ALT landmarks for astar-alt")
+    parser.add_argument("-b", "--backend", choices=BACKENDS.keys(), default="csr", help="graph representation")
+    parser.add_argument("--memory", action="store_true", help="trace the memory used by the graph (slows down building)")
+    parser.add_argument("--all-pairs", nargs="+", choices=["dijkstra", "floyd-warshall"],
+                        help="time all pairs shortest paths with these methods instead of single queries")
+    parser.add_argument("--load", action="store_true", help="time loading the graph from an adjacency matrix and "
+                        "an edge list file instead of searching (the matrix has vertices^2 cells)")
+    parser.add_argument("--mst", nargs="+", choices=["kruskal", "prim"], help="time minimum spanning trees with "
+                        "these methods and connected components instead of searching")
+    args = parser.parse_args()
+
+    coordinates = None
+    if args.geometric:
+        edges, coordinates = random_geometric_edges(args.vertices, args.edges, args.seed)
+    else:
+        edges = random_edges(args.vertices, args.edges, args.seed)
+    if args.load:
+        benchmark_loading(args.vertices, edges, args.backend)
+        exit(0)
+
+    if args.memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    graph = BACKENDS[args.backend](args.vertices, edges)
+    seconds = time.perf_counter() - start
+    print(f"Built {args.backend} graph with {graph.vertex_count} vertices and {graph.edge_count} edges in {seconds:.2f} s")
+    if args.memory:
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"Graph memory: {size / 2**20:.1f} MiB, {size / len(edges):.0f} bytes per edge")
+
+    if args.all_pairs:
+        benchmark_all_pairs(graph, args.all_pairs)
+        exit(0)
+    if args.mst:
+        benchmark_spanning_trees(graph, args.mst)
+        exit(0)
+
+    rng = random.Random(args.seed + 1)
+    if args.sources:
+        sources = [rng.randrange(args.vertices) for _ in range(args.sources)]
+        queries = [(rng.choice(sources), rng.randrange(args.vertices)) for _ in range(args.queries)]
+    else:
+        queries = [(rng.randrange(args.vertices), rng.randrange(args.vertices)) for _ in range(args.queries)]
+    cache = ShortestPathCache(graph, int(args.cache_mib * 2**20)) if "cached" in args.searches else None
+    benchmark_searches(prepare_searches(graph, args.searches, args.landmarks, coordinates, cache), queries)
+    if cache is not None:
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions, "
+              f"{len(cache)} trees in {cache.nbytes / 2**20:.1f} MiB")
@@ -0,0 +1,85 @@
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from graph import Graph, Edge, V
+
+
+class CSRGraph(Graph[V]):
+    # Frozen compressed sparse row graph: the neighbors of vertex i are indices[indptr[i]:indptr[i + 1]]
+    # with the matching weights. Like Graph every undirected edge is stored in both directions, but as
+    # one int and one float per direction instead of an Edge object. indptr is a 4 byte int unless there
+    # are 2**31 or more entries. Weights are 4 byte floats if that loses nothing (e.g. integer weights) or
+    # if single_precision is set, otherwise doubles. So an edge takes 16 bytes, or 24 with exact doubles;
+    # the vertex list and its index come on top (about 130 bytes per vertex).
+
+    def __init__(self, vertices: Optional[List[V]] = None, edges: Iterable[Tuple[int, int, float]] = (),
+                 single_precision: bool = False) -> None:
+        self._version = 0
+        self._set_vertices(list(vertices) if vertices is not None else [])
+        self._build(edges, single_precision)
+
+    def _build(self, edges: Iterable[Tuple[int, int, float]], single_precision: bool = False) -> None:
+        # Counting sort by source vertex, so the neighbors keep the order in which the edges were given
+        edges = list(edges)
+        vertex_count = len(self._vertices)
+        indptr = array('l', bytes(array('l').itemsize * (vertex_count + 1)))
+        for u, v, _ in edges:
+            indptr[u + 1] += 1
+            if u != v:
+                indptr[v + 1] += 1
+        for i in range(vertex_count):
+            indptr[i + 1] += indptr[i]
+
+        indices = array('i', bytes(array('i').itemsize * indptr[-1]))
+        weights = array('d', bytes(array('d').itemsize * indptr[-1]))
+        position = indptr[:-1]
+        for u, v, weight in edges:
+            indices[position[u]], weights[position[u]] = v, weight
+            position[u] += 1
+            if u != v:
+                indices[position[v]], weights[position[v]] = u, weight
+                position[v] += 1
+
+        if indptr[-1] < 2**31:
+            indptr = array('i', indptr)
+        single = array('f', weights)
+        if single_precision or single == weights:
+            weights = single
+
+        self._indptr: array = indptr
+        self._indices: array = indices
+        self._weights: array = weights
+
+    @classmethod
+    def from_graph(cls, graph: Graph[V], single_precision: bool = False) -> "CSRGraph[V]":
+        edges = [(edge.u, edge.v, edge.weight)
+                 for i in range(graph.vertex_count) for edge in graph.edges_for_index(i) if edge.u <= edge.v]
+        return cls([graph.vertex_at(i) for i in range(graph.vertex_count)], edges, single_precision)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._indices) // 2  # Each edge is stored twice
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(a) * a.itemsize for a in (self._indptr, self._indices, self._weights))
+
+    def add_vertex(self, vertex: V) -> int:
+        raise RuntimeError("CSRGraph is frozen, build a new one instead")
+
+    def add_edge(self, edge: Edge) -> None:
+        raise RuntimeError("CSRGraph is frozen, build a new one instead")
+
+    def edges_for_index(self, index: int) -> List[Edge]:
+        start, end = self._indptr[index], self._indptr[index + 1]
+        return [Edge(index, v, weight) for v, weight in zip(self._indices[start:end], self._weights[start:end])]
+
+    def _adjacency(self, index: int) -> Iterable[Tuple[int, float]]:
+        start, end = self._indptr[index], self._indptr[index + 1]
+        return zip(self._indices[start:end], self._weights[start:end])
+
+    def _set_graph(self, vertices: List[V], edges: Iterable[Tuple[int, int, float]]) -> None:
+        edges = list(edges)  # Builds the vertex list of an edge list file on the way
+        self._version += 1
+        self._set_vertices(vertices)
+        self._build(edges)
@@ -1,9 +1,28 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import TypeVar, Generic, List, Tuple, Optional
-from queue import PriorityQueue
+from heapq import heappop, heappush
+from typing import TypeVar, Generic, Callable, Dict, Iterable, Iterator, List, Tuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Floyd-Warshall is only used when NumPy is installed
+    np = None
+
+import loaders
+from union_find import UnionFind
 
 V = TypeVar('V')  # Typ der Knoten im Graphen
 
+# Parent rows as returned by dijkstra_by_index: parent[v] is (predecessor, weight) of the edge that reached v
+Parents = List[Optional[Tuple[int, float]]]
+
+# Lower bound for the remaining cost from a vertex to the goal: heuristic(index, goal_index)
+Heuristic = Callable[[int, int], float]
+
+# Graphs with at least this share of all possible edges count as dense for all_pairs_shortest_paths
+DENSE_THRESHOLD = 0.25
+
 
 @dataclass
 class Edge:
@@ -16,9 +35,27 @@ class Edge:
 
 
 class Graph(Generic[V]):
-    def __init__(self, vertices: List[V] = []) -> None:
+    def __init__(self, vertices: Optional[List[V]] = None) -> None:
+        self._version = 0
+        self._set_vertices(list(vertices) if vertices is not None else [])
+        self._edges: List[List[Edge]] = [[] for _ in self._vertices]
+        # (neighbor index, weight) lists built by _adjacency, valid while _neighbors_version == _version
+        self._neighbors: Dict[int, List[Tuple[int, float]]] = {}
+        self._neighbors_version = 0
+
+    def _set_vertices(self, vertices: List[V]) -> None:
+        # vertex -> index map next to the list, so index_of is a dict lookup instead of a list scan
+        index: Dict[V, int] = {}
+        for i, vertex in enumerate(vertices):
+            if index.setdefault(vertex, i) != i:
+                raise RuntimeError(f"Duplicated vertex {vertex!r}")
         self._vertices: List[V] = vertices
-        self._edges: List[List[Edge]] = [[] for _ in vertices]
+        self._index: Dict[V, int] = index
+
+    @property
+    def version(self) -> int:
+        # Incremented by every change of vertices or edges, so caches of search results can tell they are stale
+        return self._version
 
     @property
     def vertex_count(self) -> int:
@@ -29,15 +66,25 @@ class Graph(Generic[V]):
         return sum(len(edges) for edges in self._edges) // 2  # Each edge is stored twice
 
     def add_vertex(self, vertex: V) -> int:
+        if vertex in self._index:
+            raise RuntimeError(f"Duplicated vertex {vertex!r}")
+        self._index[vertex] = len(self._vertices)
         self._vertices.append(vertex)
         self._edges.append([])
+        self._version += 1
         return len(self._vertices) - 1
 
+    def add_vertices(self, vertices: Iterable[V]) -> List[int]:
+        return [self.add_vertex(vertex) for vertex in vertices]
+
     def add_edge(self, edge: Edge) -> None:
+        reverse = Edge(edge.v, edge.u, edge.weight)
         if edge not in self._edges[edge.u]:
             self._edges[edge.u].append(edge)
-        if edge not in self._edges[edge.v]:
-            self._edges[edge.v].append(Edge(edge.v, edge.u, edge.weight))
+            self._version += 1
+        if reverse not in self._edges[edge.v]:
+            self._edges[edge.v].append(reverse)
+            self._version += 1
 
     def add_edge_by_indices(self, u: int, v: int, w=1) -> Edge:
         edge = Edge(u, v, w)
@@ -48,46 +95,75 @@ class Graph(Generic[V]):
         u, v = self.index_of(first), self.index_of(second)
         return self.add_edge_by_indices(u, v, w)
 
+    def add_edges(self, edges: Iterable[Tuple[V, V, float]]) -> List[Edge]:
+        return [self.add_edge_by_vertices(first, second, w) for first, second, w in edges]
+
     def vertex_at(self, index: int) -> V:
         return self._vertices[index]
 
     def index_of(self, vertex: V) -> int:
-        return self._vertices.index(vertex)
+        try:
+            return self._index[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
 
     def neighbors_for_index_with_weights(self, index: int) -> List[Tuple[V, float]]:
-        return [(self.vertex_at(edge.v), edge.weight) for edge in self._edges[index]]
+        return [(self.vertex_at(v), weight) for v, weight in self._adjacency(index)]
 
     def edges_for_index(self, index: int) -> List[Edge]:
         return self._edges[index]
 
+    def _adjacency(self, index: int) -> Iterable[Tuple[int, float]]:
+        # (neighbor index, weight) pairs; the search algorithms only use this, so other backends just override it.
+        # The pairs of a vertex are built once and reused until the graph changes.
+        if self._neighbors_version != self._version:
+            self._neighbors = {}
+            self._neighbors_version = self._version
+        neighbors = self._neighbors.get(index)
+        if neighbors is None:
+            neighbors = self._neighbors[index] = [(edge.v, edge.weight) for edge in self._edges[index]]
+        return neighbors
+
     def edge_list_to_string(self, edge_list: List[Edge], showWeights: bool = False) -> str:
         if showWeights:
             return "->".join(f"{self.vertex_at(e.u)}-{e.weight}->{self.vertex_at(e.v)}" for e in edge_list)
         return "->".join(f"{self.vertex_at(e.u)}" for e in edge_list) + f"->{self.vertex_at(edge_list[-1].v)}"
 
-    def set_adjacency_matrix(self, lines: List[str]) -> None:
-        lines = [line.strip() for line in lines if line.strip()]
-        headers = lines[0].split(";")[1:]
-        if len(headers) != len(set(headers)):
-            raise RuntimeError("Duplicated Nodes in Adjacency Matrix")
-
-        self._vertices = headers
-        self._edges = [[] for _ in headers]
-        for i, line in enumerate(lines[1:]):
-            parts = line.split(";")
-            if parts[0] != headers[i]:
-                raise RuntimeError("Row headers do not match column headers")
-            if len(parts[1:]) != len(headers):
-                raise RuntimeError("Row length does not match column count")
-
-            for j, weight in enumerate(parts[1:]):
-                weight = weight.strip()
-                if weight:
-                    self.add_edge_by_indices(i, j, float(weight))
-
-    def read_graph_from_adjacency_matrix_file(self, filename: str) -> None:
+    def _set_graph(self, vertices: List[V], edges: Iterable[Tuple[int, int, float]]) -> None:
+        # Replaces the whole graph in one pass: every (u, v, weight) is one undirected edge and is appended
+        # without the duplicate checks of add_edge, so the loaders have to give each edge only once.
+        # vertices may still grow while edges is consumed (edge lists name their vertices on the way).
+        adjacency: List[List[Edge]] = [[] for _ in vertices]
+        for u, v, weight in edges:
+            for _ in range(len(adjacency), max(u, v) + 1):
+                adjacency.append([])
+            adjacency[u].append(Edge(u, v, weight))
+            if u != v:
+                adjacency[v].append(Edge(v, u, weight))
+        adjacency.extend([] for _ in range(len(vertices) - len(adjacency)))
+
+        self._version += 1
+        self._set_vertices(vertices)
+        self._edges = adjacency
+
+    def set_adjacency_matrix(self, lines: Iterable[str], use_numpy: bool = False) -> None:
+        # Rows are parsed one at a time (lines may be an open file), only the upper triangle is read
+        headers, edges = (loaders.matrix_edges_numpy if use_numpy else loaders.matrix_edges)(lines)
+        self._set_graph(headers, edges)
+
+    def read_graph_from_adjacency_matrix_file(self, filename: str, use_numpy: Optional[bool] = None) -> None:
+        # NumPy converts the cells of each row in bulk and is used by default if it is installed
         with open(filename, 'r') as file:
-            self.set_adjacency_matrix(file.readlines())
+            self.set_adjacency_matrix(file, use_numpy if use_numpy is not None else np is not None)
+
+    def set_edge_list(self, lines: Iterable[str]) -> None:
+        # Sparse "u;v;w" lines instead of a matrix, see loaders.edge_list_edges
+        vertices, edges = loaders.edge_list_edges(lines)
+        self._set_graph(vertices, edges)
+
+    def read_graph_from_edge_list_file(self, filename: str) -> None:
+        with open(filename, 'r') as file:
+            self.set_edge_list(file)
 
     def __str__(self) -> str:
         return "\n".join(f"{v} -> {self.neighbors_for_index_with_weights(i)}" for i, v in enumerate(self._vertices))
@@ -96,23 +172,321 @@ class Graph(Generic[V]):
         start_index, goal_index = self.index_of(start), self.index_of(goal)
         return self.uniform_cost_search_by_index(start_index, goal_index)
 
-    def uniform_cost_search_by_index(self, start_index: int, goal_index: int) -> Tuple[List[Edge], str, float]:
-        pq = PriorityQueue()
-        pq.put((0, start_index, []))
-        visited = set()
+    def dijkstra_by_index(self, start_index: int, goal_index: Optional[int] = None,
+                          stats: Optional[Dict[str, int]] = None) -> Tuple[List[float], Parents]:
+        # dist/parent arrays instead of paths in the queue; an entry whose cost is above dist is stale and skipped.
+        # parent[v] is the (predecessor, weight) pair of the edge that reached v.
+        settled = 0
+        dist: List[float] = [float('inf')] * self.vertex_count
+        parent: List[Optional[Tuple[int, float]]] = [None] * self.vertex_count
+        dist[start_index] = 0
+        heap: List[Tuple[float, int]] = [(0, start_index)]
+
+        while heap:
+            cost, current = heappop(heap)
+            if cost > dist[current]:
+                continue
+            settled += 1
+            if current == goal_index:
+                break
+
+            for v, weight in self._adjacency(current):
+                new_cost = cost + weight
+                if new_cost < dist[v]:
+                    dist[v] = new_cost
+                    parent[v] = (current, weight)
+                    heappush(heap, (new_cost, v))
+
+        if stats is not None:
+            stats["settled"] = settled
+        return dist, parent
 
-        while not pq.empty():
-            cost, current, path = pq.get()
-            if current in visited:
+    @staticmethod
+    def path_from_parents(parent: Parents, goal_index: int) -> List[Edge]:
+        path: List[Edge] = []
+        while parent[goal_index] is not None:
+            u, weight = parent[goal_index]
+            path.append(Edge(u, goal_index, weight))
+            goal_index = u
+        return path[::-1]
+
+    @staticmethod
+    def _path_from_parent_dict(parent: Dict[int, Tuple[int, float]], goal_index: int) -> List[Edge]:
+        # Same as path_from_parents for the sparse searches, where the start has no entry
+        path: List[Edge] = []
+        while goal_index in parent:
+            u, weight = parent[goal_index]
+            path.append(Edge(u, goal_index, weight))
+            goal_index = u
+        return path[::-1]
+
+    def uniform_cost_search_by_index(self, start_index: int, goal_index: int,
+                                     stats: Optional[Dict[str, int]] = None) -> Tuple[List[Edge], str, float]:
+        dist, parent = self.dijkstra_by_index(start_index, goal_index, stats)
+        if dist[goal_index] == float('inf'):
+            return [], "No Path", float('inf')
+
+        path = self.path_from_parents(parent, goal_index)
+        path_str = self.edge_list_to_string(path, showWeights=True)
+        return path, path_str, dist[goal_index]
+
+    def bidirectional_search(self, start: V, goal: V) -> Tuple[List[Edge], str, float]:
+        return self.bidirectional_search_by_index(self.index_of(start), self.index_of(goal))
+
+    def bidirectional_search_by_index(self, start_index: int, goal_index: int,
+                                      stats: Optional[Dict[str, int]] = None) -> Tuple[List[Edge], str, float]:
+        # Dijkstra from both ends at once (edges are undirected, so the backward search uses the same adjacency),
+        # always advancing the side with the smaller queue head. best is the cheapest start-goal connection seen
+        # so far; once the two queue heads together cost at least best, no shorter connection can appear.
+        # Dicts instead of arrays, so a query only touches the vertices it reaches.
+        dist: Tuple[Dict[int, float], Dict[int, float]] = ({start_index: 0}, {goal_index: 0})
+        parent: Tuple[Dict[int, Tuple[int, float]], Dict[int, Tuple[int, float]]] = ({}, {})
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0, start_index)], [(0, goal_index)])
+        best, meeting = (0, start_index) if start_index == goal_index else (float('inf'), -1)
+        settled = 0
+
+        while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            own_dist, other_dist = dist[side], dist[1 - side]
+            cost, current = heappop(heaps[side])
+            if cost > own_dist[current]:
                 continue
-            visited.add(current)
+            settled += 1
+
+            for v, weight in self._adjacency(current):
+                new_cost = cost + weight
+                if new_cost < own_dist.get(v, float('inf')):
+                    own_dist[v] = new_cost
+                    parent[side][v] = (current, weight)
+                    heappush(heaps[side], (new_cost, v))
+                    if v in other_dist and new_cost + other_dist[v] < best:
+                        best, meeting = new_cost + other_dist[v], v
 
+        if stats is not None:
+            stats["settled"] = settled
+        if meeting < 0:
+            return [], "No Path", float('inf')
+
+        path = self._path_from_parent_dict(parent[0], meeting)
+        v = meeting
+        while v in parent[1]:
+            u, weight = parent[1][v]
+            path.append(Edge(v, u, weight))
+            v = u
+        return path, self.edge_list_to_string(path, showWeights=True), best
+
+    def astar_search(self, start: V, goal: V, heuristic: Heuristic) -> Tuple[List[Edge], str, float]:
+        return self.astar_search_by_index(self.index_of(start), self.index_of(goal), heuristic)
+
+    def astar_search_by_index(self, start_index: int, goal_index: int, heuristic: Heuristic,
+                              stats: Optional[Dict[str, int]] = None) -> Tuple[List[Edge], str, float]:
+        # Like dijkstra_by_index, but the queue is ordered by cost + heuristic(v, goal). The heuristic has to be
+        # admissible (never above the real remaining cost); since vertices are not closed, a better cost found
+        # later simply requeues the vertex, so it does not have to be consistent as well.
+        dist: Dict[int, float] = {start_index: 0}
+        parent: Dict[int, Tuple[int, float]] = {}
+        heap: List[Tuple[float, float, int]] = [(heuristic(start_index, goal_index), 0, start_index)]
+        settled = 0
+
+        while heap:
+            _, cost, current = heappop(heap)
+            if cost > dist[current]:
+                continue
+            settled += 1
             if current == goal_index:
-                path_str = self.edge_list_to_string(path, showWeights=True)
-                return path, path_str, cost
+                break
+
+            for v, weight in self._adjacency(current):
+                new_cost = cost + weight
+                if new_cost < dist.get(v, float('inf')):
+                    dist[v] = new_cost
+                    parent[v] = (current, weight)
+                    heappush(heap, (new_cost + heuristic(v, goal_index), new_cost, v))
+
+        if stats is not None:
+            stats["settled"] = settled
+        if goal_index not in dist:
+            return [], "No Path", float('inf')
+
+        path = self._path_from_parent_dict(parent, goal_index)
+        return path, self.edge_list_to_string(path, showWeights=True), dist[goal_index]
+
+    def minimum_spanning_tree(self, method: str = "kruskal") -> Tuple[List[Edge], float]:
+        # Edges and total weight of a minimum spanning tree, of a minimum spanning forest if the graph is not
+        # connected. method is "kruskal" (sorted edges and union-find) or "prim" (heap over the adjacency)
+        if method == "kruskal":
+            return self.kruskal_mst()
+        if method == "prim":
+            return self.prim_mst()
+        raise RuntimeError(f"Unknown spanning tree method {method!r}")
+
+    def kruskal_mst(self) -> Tuple[List[Edge], float]:
+        # Every undirected edge once (u <= v) sorted by weight; an edge joining two different trees is taken
+        edges = [(weight, u, v) for u in range(self.vertex_count) for v, weight in self._adjacency(u) if u < v]
+        edges.sort()
+        sets = UnionFind(self.vertex_count)
+        tree: List[Edge] = []
+        total = 0
+        for weight, u, v in edges:
+            if sets.union(u, v):
+                tree.append(Edge(u, v, weight))
+                total += weight
+                if sets.count == 1:
+                    break
+        return tree, total
+
+    def prim_mst(self) -> Tuple[List[Edge], float]:
+        # Grows one tree from every vertex that is not in a tree yet. best[v] is the cheapest known edge from
+        # the tree to v; like dist in dijkstra_by_index it is only pushed when it improves, and stale heap
+        # entries are skipped instead of decreasing keys
+        in_tree = [False] * self.vertex_count
+        best = [float('inf')] * self.vertex_count
+        tree: List[Edge] = []
+        total = 0
+        for root in range(self.vertex_count):
+            if in_tree[root]:
+                continue
+            heap: List[Tuple[float, int, int]] = [(0, root, -1)]
+            while heap:
+                weight, v, u = heappop(heap)
+                if in_tree[v]:
+                    continue
+                in_tree[v] = True
+                if u >= 0:
+                    tree.append(Edge(u, v, weight))
+                    total += weight
+                for w, weight in self._adjacency(v):
+                    if weight < best[w] and not in_tree[w]:
+                        best[w] = weight
+                        heappush(heap, (weight, w, v))
+        return tree, total
+
+    def connected_components(self) -> List[int]:
+        # Component number of every vertex, numbered in order of their smallest vertex index. Iterative depth
+        # first search, so every vertex and edge is visited once and deep graphs cannot hit the recursion limit
+        component = [-1] * self.vertex_count
+        count = 0
+        for root in range(self.vertex_count):
+            if component[root] >= 0:
+                continue
+            component[root] = count
+            stack = [root]
+            while stack:
+                for v, _ in self._adjacency(stack.pop()):
+                    if component[v] < 0:
+                        component[v] = count
+                        stack.append(v)
+            count += 1
+        return component
+
+    def all_pairs_shortest_paths(self, method: Optional[str] = None,
+                                 processes: Optional[int] = None) -> Tuple[List[List[float]], List[Parents]]:
+        # dist[s][v] and parent rows for every source s. method is "dijkstra" (one heap Dijkstra per source,
+        # spread over a process pool) or "floyd-warshall" (vectorized with NumPy); by default dense graphs
+        # use Floyd-Warshall if NumPy is installed.
+        if method is None:
+            dense = self.vertex_count > 0 and 2 * self.edge_count >= DENSE_THRESHOLD * self.vertex_count ** 2
+            method = "floyd-warshall" if dense and np is not None else "dijkstra"
+        if method == "floyd-warshall":
+            return self._floyd_warshall()
+        if method != "dijkstra":
+            raise RuntimeError(f"Unknown all pairs method {method!r}")
+
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or self.vertex_count < 2:
+            rows = [self.dijkstra_by_index(source) for source in range(self.vertex_count)]
+        else:
+            chunksize = max(1, self.vertex_count // (4 * processes))
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self,)) as pool:
+                rows = list(pool.map(_dijkstra_row, range(self.vertex_count), chunksize=chunksize))
+        return [dist for dist, _ in rows], [parent for _, parent in rows]
+
+    def _floyd_warshall(self) -> Tuple[List[List[float]], List[Parents]]:
+        if np is None:
+            raise RuntimeError("Floyd-Warshall needs NumPy")
+        n = self.vertex_count
+        weights = np.full((n, n), np.inf)
+        for u in range(n):
+            for v, weight in self._adjacency(u):
+                weights[u, v] = min(weights[u, v], weight)
+        np.fill_diagonal(weights, 0)
+
+        dist = weights.copy()
+        pred = np.where(np.isfinite(weights), np.arange(n)[:, None], -1)
+        np.fill_diagonal(pred, -1)
+        for k in range(n):
+            via_k = dist[:, k, None] + dist[None, k, :]
+            shorter = via_k < dist
+            dist = np.where(shorter, via_k, dist)
+            pred = np.where(shorter, pred[None, k, :], pred)
+
+        parents = [[(int(u), float(weights[u, v])) if u >= 0 else None for v, u in enumerate(row)]
+                   for row in pred.tolist()]
+        return dist.tolist(), parents
+
+    def eccentricities(self, dist: Optional[List[List[float]]] = None) -> List[float]:
+        # Largest distance from every vertex, inf if some vertex is unreachable
+        if dist is None:
+            dist, _ = self.all_pairs_shortest_paths()
+        return [max(row, default=0) for row in dist]
+
+    def diameter(self, dist: Optional[List[List[float]]] = None) -> float:
+        return max(self.eccentricities(dist), default=0)
+
+    def get_longest_shortest_path_in_graph(self, apsp: Optional[Tuple[List[List[float]], List[Parents]]] = None) -> Tuple[List[Edge], str, float]:
+        # Longest of all shortest paths between connected vertices (the diameter of a connected graph)
+        dist, parents = apsp if apsp is not None else self.all_pairs_shortest_paths()
+        best: Optional[Tuple[float, int, int]] = None
+        for source, row in enumerate(dist):
+            for goal, cost in enumerate(row):
+                if goal != source and cost != float('inf') and (best is None or cost > best[0]):
+                    best = (cost, source, goal)
+        if best is None:
+            return [], "No Path", float('inf')
+
+        cost, source, goal = best
+        path = self.path_from_parents(parents[source], goal)
+        return path, self.edge_list_to_string(path, showWeights=True), cost
+
+    def get_all_paths(self, start: V, goal: Optional[V] = None) -> Iterator[List[Edge]]:
+        # Every path without repeated vertices that starts at start (and ends at goal, if given), one at a
+        # time: the number of paths grows exponentially, so they are never collected in a list.
+        # Explicit stack of neighbor iterators, one per vertex on the current path.
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal) if goal is not None else None
+        on_path = [False] * self.vertex_count
+        on_path[start_index] = True
+        path: List[Edge] = []
+        stack = [iter(self._adjacency(start_index))]
+        current = start_index
+
+        while stack:
+            for v, weight in stack[-1]:
+                if not on_path[v]:
+                    path.append(Edge(current, v, weight))
+                    if goal_index is None or v == goal_index:
+                        yield list(path)
+                    if v == goal_index:
+                        path.pop()
+                        continue
+                    on_path[v] = True
+                    stack.append(iter(self._adjacency(v)))
+                    current = v
+                    break
+            else:
+                stack.pop()
+                on_path[current] = False
+                if path:
+                    current = path.pop().u
+
+
+_worker_graph: Optional[Graph] = None  # Graph of an all pairs worker process, set by _init_worker
+
+
+def _init_worker(graph: Graph) -> None:
+    global _worker_graph
+    _worker_graph = graph
 
-            for edge in self.edges_for_index(current):
-                if edge.v not in visited:
-                    pq.put((cost + edge.weight, edge.v, path + [edge]))
 
-        return [], "No Path", float('inf')
+def _dijkstra_row(source: int) -> Tuple[List[float], Parents]:
+    return _worker_graph.dijkstra_by_index(source)
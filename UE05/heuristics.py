@@ -0,0 +1,50 @@
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from graph import Graph, Heuristic, V
+
+
+def euclidean_heuristic(graph: Graph[V], coordinates: Dict[V, Tuple[float, float]], scale: float = 1.0) -> Heuristic:
+    # Straight-line distance between the coordinates of two vertices. Admissible as long as no edge is
+    # cheaper than scale times the distance between its endpoints.
+    points = [coordinates[graph.vertex_at(i)] for i in range(graph.vertex_count)]
+
+    def heuristic(index: int, goal_index: int) -> float:
+        (x1, y1), (x2, y2) = points[index], points[goal_index]
+        return scale * math.hypot(x1 - x2, y1 - y2)
+
+    return heuristic
+
+
+class Landmarks:
+    # ALT lower bounds (A*, landmarks, triangle inequality): for a landmark L the triangle inequality gives
+    # d(v, goal) >= |d(L, goal) - d(L, v)|, the heuristic is the best bound over all landmarks. The
+    # distances from each landmark are computed once with Dijkstra and kept as one array per landmark.
+    # Landmarks are picked farthest-first: each new one is the vertex farthest from the ones chosen so far.
+
+    def __init__(self, graph: Graph[V], count: int = 8, first: Optional[int] = None) -> None:
+        self.landmarks: List[int] = []
+        self.distances: List[array] = []
+        if graph.vertex_count == 0:
+            return
+
+        nearest = [float('inf')] * graph.vertex_count
+        landmark = first if first is not None else 0
+        for _ in range(min(count, graph.vertex_count)):
+            dist, _ = graph.dijkstra_by_index(landmark)
+            self.landmarks.append(landmark)
+            self.distances.append(array('d', dist))
+            nearest = [min(a, b) for a, b in zip(nearest, dist)]
+            # Unreachable vertices are skipped: they cannot tighten any bound of this component
+            landmark = max((i for i, d in enumerate(nearest) if d != float('inf')), key=nearest.__getitem__)
+            if nearest[landmark] == 0:
+                break
+
+    def __call__(self, index: int, goal_index: int) -> float:
+        best = 0.0
+        for dist in self.distances:
+            bound = abs(dist[goal_index] - dist[index])
+            if bound > best and bound != float('inf'):
+                best = bound
+        return best
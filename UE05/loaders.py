@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy matrix rows are parsed cell by cell
+    np = None
+
+# An edge given by vertex indices: (u, v, weight)
+IndexEdge = Tuple[int, int, float]
+
+
+def _nonblank(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _matrix_rows(lines: Iterable[str]) -> Tuple[List[str], Iterator[Tuple[int, str]]]:
+    # Header names and an iterator of (row index, line) with the same checks as Graph.set_adjacency_matrix
+    lines = _nonblank(lines)
+    headers = next(lines, "").split(";")[1:]
+    if len(headers) != len(set(headers)):
+        raise RuntimeError("Duplicated Nodes in Adjacency Matrix")
+
+    def rows() -> Iterator[Tuple[int, str]]:
+        for i, line in enumerate(lines):
+            if i >= len(headers) or line.split(";", 1)[0] != headers[i]:
+                raise RuntimeError("Row headers do not match column headers")
+            if line.count(";") != len(headers):
+                raise RuntimeError("Row length does not match column count")
+            yield i, line
+
+    return headers, rows()
+
+
+def matrix_edges(lines: Iterable[str]) -> Tuple[List[str], Iterator[IndexEdge]]:
+    # Streams the edges of an adjacency matrix one row at a time. The matrix of an undirected graph is
+    # symmetric, so only the upper triangle (diagonal included) is parsed and every edge comes out once.
+    headers, rows = _matrix_rows(lines)
+
+    def edges() -> Iterator[IndexEdge]:
+        for i, line in rows:
+            for j, weight in enumerate(line.split(";")[i + 1:], i):
+                if weight and not weight.isspace():
+                    yield i, j, float(weight)
+
+    return headers, edges()
+
+
+def matrix_edges_numpy(lines: Iterable[str]) -> Tuple[List[str], Iterator[IndexEdge]]:
+    # Same as matrix_edges, but NumPy finds the separators of a row in bulk, so only the non-empty cells of
+    # the upper triangle are ever touched in Python. That matters for large sparse matrices.
+    if np is None:
+        raise RuntimeError("matrix_edges_numpy needs NumPy")
+    headers, rows = _matrix_rows(lines)
+    semicolon = ord(";")
+
+    def edges() -> Iterator[IndexEdge]:
+        for i, line in rows:
+            data = line.encode()
+            # Cell j lies between separators j and j + 1; the last cell ends at the end of the line
+            bounds = np.append(np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == semicolon), len(data))[i:]
+            for j in np.flatnonzero(np.diff(bounds) > 1).tolist():
+                weight = data[bounds[j] + 1:bounds[j + 1]]
+                if not weight.isspace():
+                    yield i, i + j, float(weight)
+
+    return headers, edges()
+
+
+def edge_list_edges(lines: Iterable[str]) -> Tuple[List[str], Iterator[IndexEdge]]:
+    # Sparse format with one "u;v;w" line per undirected edge (w defaults to 1) and "u" for a single vertex.
+    # Vertices get their indices in order of first appearance; the list is filled while the edges are read,
+    # so it is only complete once the iterator is exhausted. Repeated edges (also as "v;u;w") are dropped.
+    vertices: List[str] = []
+    index: Dict[str, int] = {}
+
+    def index_of(vertex: str) -> int:
+        if vertex not in index:
+            index[vertex] = len(vertices)
+            vertices.append(vertex)
+        return index[vertex]
+
+    def edges() -> Iterator[IndexEdge]:
+        seen: Set[IndexEdge] = set()
+        for line in _nonblank(lines):
+            parts = [part.strip() for part in line.split(";")]
+            if len(parts) == 1:
+                index_of(parts[0])
+                continue
+            if len(parts) > 3:
+                raise RuntimeError(f"Edge list line {line!r} has more than three fields")
+            u, v = index_of(parts[0]), index_of(parts[1])
+            weight = float(parts[2]) if len(parts) == 3 and parts[2] else 1
+            key = (min(u, v), max(u, v), weight)
+            if key not in seen:
+                seen.add(key)
+                yield u, v, weight
+
+    return vertices, edges()
@@ -11,5 +11,6 @@ if __name__ == "__main__":
     (edgelist, path, cost) = g.get_longest_shortest_path_in_graph()
     print(path)
     print(cost)
-    print(g.get_all_paths("A"))
-    print(g.get_all_paths("H"))
+    for start in ("A", "H"):
+        for edgelist in g.get_all_paths(start):
+            print(g.edge_list_to_string(edgelist))
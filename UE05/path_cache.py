@@ -0,0 +1,118 @@
+from array import array
+from collections import OrderedDict
+from typing import List, Tuple
+
+from graph import Graph, Edge, V
+
+# Shortest path tree of one source: dist, predecessor (-1 for the source and unreachable vertices) and the
+# weight of the edge from the predecessor, one compact array each
+Tree = Tuple[array, array, array]
+
+# Default memory budget of a ShortestPathCache in bytes
+DEFAULT_BUDGET = 64 * 2**20
+
+
+class ShortestPathCache:
+    # Answers repeated point-to-point queries on a graph that rarely changes. The first query from a source runs
+    # a full Dijkstra and keeps its shortest path tree, later queries from the same source only walk parent
+    # pointers. Edges are undirected, so a cached tree of the goal answers the query as well, walked backwards.
+    # Trees are kept in least recently used order and the oldest ones are dropped once they need more than
+    # max_bytes. Any change of the graph (see Graph.version) throws away all trees.
+
+    def __init__(self, graph: Graph[V], max_bytes: int = DEFAULT_BUDGET) -> None:
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._trees: "OrderedDict[int, Tree]" = OrderedDict()
+        self._nbytes = 0
+        self._version = graph.version
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def hit_rate(self) -> float:
+        queries = self.hits + self.misses
+        return self.hits / queries if queries else 0.0
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self._nbytes = 0
+
+    def _check_version(self) -> None:
+        if self._version != self.graph.version:
+            if self._trees:
+                self.invalidations += 1
+            self.clear()
+            self._version = self.graph.version
+
+    def tree(self, source_index: int) -> Tree:
+        # Shortest path tree of source_index, from the cache if possible
+        self._check_version()
+        tree = self._trees.get(source_index)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source_index)
+            return tree
+
+        self.misses += 1
+        dist, parent = self.graph.dijkstra_by_index(source_index)
+        tree = (array('d', dist),
+                array('i', [p[0] if p is not None else -1 for p in parent]),
+                array('d', [p[1] if p is not None else 0 for p in parent]))
+        self._store(source_index, tree)
+        return tree
+
+    def _store(self, source_index: int, tree: Tree) -> None:
+        size = sum(len(a) * a.itemsize for a in tree)
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        self._trees[source_index] = tree
+        self._nbytes += size
+        while self._nbytes > self.max_bytes:
+            _, old = self._trees.popitem(last=False)
+            self._nbytes -= sum(len(a) * a.itemsize for a in old)
+            self.evictions += 1
+
+    def search(self, start: V, goal: V) -> Tuple[List[Edge], str, float]:
+        return self.search_by_index(self.graph.index_of(start), self.graph.index_of(goal))
+
+    def search_by_index(self, start_index: int, goal_index: int) -> Tuple[List[Edge], str, float]:
+        # Same result as Graph.uniform_cost_search_by_index
+        self._check_version()
+        if start_index not in self._trees and goal_index in self._trees:
+            dist, pred, weights = self.tree(goal_index)
+            path = self._walk(pred, weights, start_index, reverse=True)
+            cost = dist[start_index]
+        else:
+            dist, pred, weights = self.tree(start_index)
+            path = self._walk(pred, weights, goal_index)
+            cost = dist[goal_index]
+
+        if cost == float('inf'):
+            return [], "No Path", float('inf')
+        return path, self.graph.edge_list_to_string(path, showWeights=True), cost
+
+    @staticmethod
+    def _walk(pred: array, weights: array, index: int, reverse: bool = False) -> List[Edge]:
+        # Edges from the tree root to index, or from index back to the root if reverse
+        path: List[Edge] = []
+        while pred[index] >= 0:
+            u = pred[index]
+            path.append(Edge(index, u, weights[index]) if reverse else Edge(u, index, weights[index]))
+            index = u
+        return path if reverse else path[::-1]
+
+    def distance(self, start: V, goal: V) -> float:
+        start_index, goal_index = self.graph.index_of(start), self.graph.index_of(goal)
+        self._check_version()
+        if start_index not in self._trees and goal_index in self._trees:
+            return self.tree(goal_index)[0][start_index]
+        return self.tree(start_index)[0][goal_index]
@@ -0,0 +1,33 @@
+from array import array
+
+
+class UnionFind:
+    # Disjoint sets over the indices 0..n-1 with union by rank and path compression, so a sequence of m
+    # operations takes O(m * alpha(n)), practically constant time each. Parents and ranks are kept in arrays.
+
+    def __init__(self, n: int) -> None:
+        self._parent = array('i', range(n))
+        self._rank = array('b', bytes(n))
+        self.count = n  # Number of disjoint sets
+
+    def find(self, x: int) -> int:
+        parent = self._parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # Second pass: hang every vertex on the way directly below the root
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x: int, y: int) -> bool:
+        # Joins the sets of x and y, False if they were already the same set
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        if self._rank[x] < self._rank[y]:
+            x, y = y, x
+        self._parent[y] = x
+        if self._rank[x] == self._rank[y]:
+            self._rank[x] += 1
+        self.count -= 1
+        return True
@@ -0,0 +1,59 @@
+__author__ = "Hanno Postl"
+__version__ = "1.0"
+__status__ = "Finished"
+
+import argparse
+import random
+import string
+from time import perf_counter
+from typing import Any, Callable, List
+
+from main import Candidate, Dataset, build_tree_id3, classify, classify_dataset, compile_tree, predict_compiled
+
+
+# Funktion zur Erzeugung zufälliger Kandidaten
+def random_candidates(count: int, seed: int) -> List[Candidate]:
+    """Zufällige Kandidaten; das Label hängt teilweise von den Attributen ab, damit der Baum Struktur hat."""
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        anfangsbuchstabe = rng.choice(string.ascii_uppercase)
+        puenktlich, htl = rng.random() < 0.6, rng.random() < 0.4
+        sprache = rng.choice(["Java", "Python", "C", "Whitespace", "Go"])
+        erfolgreich = (puenktlich and sprache != "Whitespace") if rng.random() < 0.8 else rng.random() < 0.5
+        candidates.append(Candidate(anfangsbuchstabe, puenktlich, htl, sprache, erfolgreich))
+    return candidates
+
+
+# Funktion zur Messung einer Vorhersagemethode
+def measure(name: str, predict: Callable[[], List[Any]], rows: int, expected: List[Any]) -> None:
+    """Misst eine Vorhersage über alle Zeilen und gibt Sekunden und Zeilen pro Sekunde aus."""
+    start = perf_counter()
+    predictions = predict()
+    seconds = perf_counter() - start
+    print(f"{name:<20}{seconds:>10.3f}{rows / seconds:>15,.0f}")
+    if predictions != expected:
+        print(f"Warnung: {name} liefert andere Vorhersagen als classify")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark batch prediction of the UE06 decision tree")
+    parser.add_argument("-n", "--rows", type=int, default=1_000_000, help="rows to predict")
+    parser.add_argument("-t", "--training", type=int, default=100_000, help="training rows")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed for the random candidates")
+    args = parser.parse_args()
+
+    attributes = list(Candidate._fields)
+    tree = build_tree_id3(random_candidates(args.training, args.seed), attributes[:-1], attributes[-1])
+    inputs = random_candidates(args.rows, args.seed + 1)
+
+    start = perf_counter()
+    data = Dataset.from_inputs(inputs, attributes[:-1], attributes[-1])
+    compiled = compile_tree(tree)
+    print(f"Kodieren und Übersetzen: {perf_counter() - start:.3f} s, {len(compiled.feature)} Knoten")
+
+    print(f"{'Methode':<20}{'Sekunden':>10}{'Zeilen/s':>15}")
+    expected = [classify(tree, input) for input in inputs]
+    measure("classify", lambda: [classify(tree, input) for input in inputs], args.rows, expected)
+    measure("classify_dataset", lambda: classify_dataset(tree, data), args.rows, expected)
+    measure("predict_compiled", lambda: predict_compiled(compiled, data), args.rows, expected)
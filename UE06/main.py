@@ -1,12 +1,18 @@
 __author__ = "Hanno Postl"
-__version__ = "1.6"
+__version__ = "2.1"
 __status__ = "Finished"
 
 import argparse
 import csv
+import io
 import math
+import os
 import sys
-from collections import defaultdict, Counter
+from array import array
+from collections import defaultdict, deque, namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import attrgetter
 from typing import List, Optional, TypeVar, Dict, NamedTuple, Union, Any
 
 import matplotlib.pyplot as plt
@@ -25,21 +31,27 @@ class Candidate(NamedTuple):
 # Definiere einen generischen Typ
 T = TypeVar('T')
 
+# Anzahl der Zeilen, die beim Einlesen auf einmal kodiert werden
+CHUNK_SIZE = 65536
+
+# Entropien, die sich um weniger unterscheiden, gelten beim Aufbau des Baums als gleich
+ENTROPY_TOLERANCE = 1e-12
+
+
+# Funktion zur Umwandlung einer CSV-Zeile in eine Candidate-Instanz
+def parse_candidate(row: Dict[str, str]) -> Candidate:
+    anfangsbuchstabe = row['name'][0]
+    puenktlich = row['puenktlich'] == 'ja'
+    htl = row['htl'] == 'ja'
+    sprache = row['sprache']
+    erfolgreich = row['erfolgreich'] == 'ja' if row['erfolgreich'] else None
+    return Candidate(anfangsbuchstabe, puenktlich, htl, sprache, erfolgreich)
+
 
 # Funktion zum Einlesen der CSV-Datei und Rückgabe einer Liste von Candidate-Instanzen
 def readfile(filename: str) -> List[T]:
-    candidates: List[Candidate] = []
     with open(filename, 'r') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:
-            anfangsbuchstabe = row['name'][0]
-            puenktlich = row['puenktlich'] == 'ja'
-            htl = row['htl'] == 'ja'
-            sprache = row['sprache']
-            erfolgreich = row['erfolgreich'] == 'ja' if row['erfolgreich'] else None
-            candidate = Candidate(anfangsbuchstabe, puenktlich, htl, sprache, erfolgreich)
-            candidates.append(candidate)
-    return candidates
+        return [parse_candidate(row) for row in csv.DictReader(file, delimiter=';')]
 
 
 # Funktion zur Partitionierung der Eingaben basierend auf einem Attribut
@@ -217,6 +229,198 @@ def get_partition_min_entropy(inputs: List[Any], attributes: List[str], label_at
     return best_attribute, min_entropy
 
 
+# Funktion zur Kodierung einer Spalte als Ganzzahlen
+def encode_column(values: List[Any]) -> tuple[np.ndarray, List[Any]]:
+    """
+    Kodiert die Werte einer Spalte als Ganzzahlen, in der Reihenfolge ihres ersten Auftretens.
+
+    Parameters:
+    values (List[Any]): Die Werte der Spalte.
+
+    Returns:
+    tuple[np.ndarray, List[Any]]: Die Codes als NumPy-Array und das Vokabular, vocabulary[code] ist der Wert.
+
+    >>> codes, vocabulary = encode_column(["Java", "Python", "Java", "C"])
+    >>> codes.tolist(), vocabulary
+    ([0, 1, 0, 2], ['Java', 'Python', 'C'])
+    """
+    vocabulary = list(dict.fromkeys(values))  # dict behält die Reihenfolge des ersten Auftretens
+    index = {value: code for code, value in enumerate(vocabulary)}
+    return np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=len(values)), vocabulary
+
+
+# Funktion zur Dekodierung einer Spalte
+def decode_column(codes: np.ndarray, vocabulary: List[Any]) -> List[Any]:
+    """
+    Gegenstück zu encode_column: die Werte zu den Codes.
+
+    >>> decode_column(np.array([0, 1, 0, 2]), ['Java', 'Python', 'C'])
+    ['Java', 'Python', 'Java', 'C']
+    """
+    values = np.empty(len(vocabulary), dtype=object)
+    values[:] = vocabulary
+    return values[codes].tolist()
+
+
+# Funktion zur Berechnung der Kontingenztafeln aller Attribute in einem Durchlauf
+def contingency_tables(columns: np.ndarray, labels: np.ndarray, sizes: List[int], label_count: int) -> List[np.ndarray]:
+    """
+    Zählt für jedes Attribut, wie oft jeder Attributwert mit jedem Label vorkommt.
+
+    Alle Spalten werden mit einem einzigen np.bincount gezählt: jede Kombination aus Attribut,
+    Wert und Label bekommt einen eigenen Zähler.
+
+    Parameters:
+    columns (np.ndarray): Die kodierten Attribute, eine Zeile pro Eingabe und eine Spalte pro Attribut.
+    labels (np.ndarray): Die kodierten Labels.
+    sizes (List[int]): Die Anzahl der möglichen Werte jedes Attributs.
+    label_count (int): Die Anzahl der möglichen Labels.
+
+    Returns:
+    List[np.ndarray]: Eine Tafel pro Attribut, table[wert, label] ist die Anzahl.
+
+    >>> columns = np.array([[0, 0], [0, 1], [1, 1]])
+    >>> [table.tolist() for table in contingency_tables(columns, np.array([0, 1, 1]), [2, 2], 2)]
+    [[[1, 1], [0, 1]], [[1, 0], [0, 2]]]
+    """
+    offsets = np.cumsum([0] + [size * label_count for size in sizes])
+    keys = columns * label_count + labels[:, None] + offsets[:-1]
+    counts = np.bincount(keys.ravel(), minlength=offsets[-1])
+    return [counts[start:end].reshape(-1, label_count) for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+# Funktion zur Berechnung der Entropie einer Partition aus ihrer Kontingenztafel
+def partition_entropy_from_counts(table: np.ndarray) -> float:
+    """
+    Berechnet wie partition_entropy die Entropie einer Partition, aber aus der Kontingenztafel.
+
+    Parameters:
+    table (np.ndarray): table[wert, label] ist die Anzahl der Eingaben mit diesem Wert und Label.
+
+    Returns:
+    float: Der Entropiewert der Partition.
+
+    >>> partition_entropy_from_counts(np.array([[1, 0, 0], [1, 1, 1], [0, 3, 0]]))
+    0.6792696431662097
+    >>> partition_entropy_from_counts(np.array([[1, 0], [0, 3]]))
+    0.0
+    """
+    sizes = table.sum(axis=1)
+    table = table[sizes > 0]
+    sizes = sizes[sizes > 0]
+    probabilities = table / sizes[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probabilities > 0, -probabilities * np.log2(probabilities), 0.0)
+    return float((sizes / sizes.sum() * terms.sum(axis=1)).sum()) + 0.0
+
+
+# Klasse für einen spaltenweise gespeicherten Datensatz
+class Dataset:
+    """
+    Datensatz in Spalten statt als Liste von NamedTuples.
+
+    Jedes Attribut und das Label sind ganzzahlig kodiert (np.int32, ein Code pro Zeile), die Werte
+    selbst stehen nur einmal im Vokabular der Spalte. Teilmengen werden als Arrays von Zeilenindizes
+    weitergegeben, statt Listen zu kopieren.
+
+    >>> data = Dataset.from_inputs([Candidate('a', True, False, 'Java', True),
+    ...                             Candidate('b', False, False, 'C', False)],
+    ...                            ['puenktlich', 'sprache'], 'erfolgreich')
+    >>> len(data), data.column('sprache').tolist(), data.vocabulary('sprache')
+    (2, [0, 1], ['Java', 'C'])
+    >>> data.partition('puenktlich')
+    {True: array([0]), False: array([1])}
+    >>> data.to_inputs()[1]
+    Row(puenktlich=False, sprache='C', erfolgreich=False)
+    """
+
+    def __init__(self, attributes: List[str], columns: np.ndarray, vocabularies: List[List[Any]],
+                 label_attribute: str, labels: np.ndarray, label_values: List[Any]) -> None:
+        self.attributes = attributes
+        self.columns = columns  # columns[zeile, attribut] ist der Code des Werts
+        self.vocabularies = vocabularies
+        self.label_attribute = label_attribute
+        self.labels = labels
+        self.label_values = label_values
+        self._positions = {attribute: i for i, attribute in enumerate(attributes)}
+        self._codes = [{value: code for code, value in enumerate(vocabulary)} for vocabulary in vocabularies]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_inputs(cls, inputs: List[Any], split_attributes: List[str], target_attribute: str) -> "Dataset":
+        """Kodiert eine Liste von NamedTuples spaltenweise."""
+        encoded = [encode_column(list(map(attrgetter(attribute), inputs))) for attribute in split_attributes]
+        labels, label_values = encode_column(list(map(attrgetter(target_attribute), inputs)))
+        columns = np.empty((len(inputs), len(split_attributes)), dtype=np.int32)
+        for i, (codes, _) in enumerate(encoded):
+            columns[:, i] = codes
+        return cls(list(split_attributes), columns, [values for _, values in encoded],
+                   target_attribute, labels.astype(np.int32), label_values)
+
+    @classmethod
+    def read_csv(cls, filename: str) -> "Dataset":
+        """
+        Liest eine CSV-Datei wie readfile, aber direkt in Spalten.
+
+        Die Zeilen werden in Blöcken von CHUNK_SIZE eingelesen und sofort kodiert, nur die Codes
+        werden behalten. Das letzte Feld von Candidate ist das Label.
+        """
+        fields = list(Candidate._fields)
+        codes: List[Dict[Any, int]] = [{} for _ in fields]
+        arrays = [array('i') for _ in fields]
+        with open(filename, 'r') as file:
+            reader = csv.DictReader(file, delimiter=';')
+            while chunk := list(map(parse_candidate, islice(reader, CHUNK_SIZE))):
+                for values, index, column in zip(zip(*chunk), codes, arrays):
+                    for value in dict.fromkeys(values):  # Neue Werte in der Reihenfolge ihres ersten Auftretens
+                        index.setdefault(value, len(index))
+                    column.extend(map(index.__getitem__, values))
+
+        columns = np.empty((len(arrays[0]), len(fields) - 1), dtype=np.int32)
+        for i, column in enumerate(arrays[:-1]):
+            columns[:, i] = np.frombuffer(column, dtype=np.int32)
+        return cls(fields[:-1], columns, [list(index) for index in codes[:-1]],
+                   fields[-1], np.frombuffer(arrays[-1], dtype=np.int32).copy(), list(codes[-1]))
+
+    def position(self, attribute: str) -> int:
+        return self._positions[attribute]
+
+    def column(self, attribute: str) -> np.ndarray:
+        return self.columns[:, self._positions[attribute]]
+
+    def vocabulary(self, attribute: str) -> List[Any]:
+        return self.vocabularies[self._positions[attribute]]
+
+    def code_of(self, attribute: str, value: Any) -> Optional[int]:
+        """Code eines Werts, None falls er in der Spalte nicht vorkommt."""
+        return self._codes[self._positions[attribute]].get(value)
+
+    def partition(self, attribute: str, rows: Optional[np.ndarray] = None) -> Dict[Any, np.ndarray]:
+        """
+        Gegenstück zu partition_by: die Zeilenindizes zu jedem Wert des Attributs,
+        die Werte in der Reihenfolge ihres ersten Auftretens in rows.
+        """
+        rows = np.arange(len(self)) if rows is None else rows
+        if not len(rows):
+            return {}
+        values = self.columns[rows, self._positions[attribute]]
+        order = np.argsort(values, kind='stable')
+        present, starts = np.unique(values[order], return_index=True)
+        groups = np.split(rows[order], starts[1:])
+        vocabulary = self.vocabulary(attribute)
+        return {vocabulary[present[i]]: groups[i]
+                for i in np.argsort([group[0] for group in groups], kind='stable')}
+
+    def to_inputs(self) -> List[Any]:
+        """Die Zeilen wieder als NamedTuples, Candidate falls die Spalten genau dessen Felder sind."""
+        fields = self.attributes + [self.label_attribute]
+        row_type = Candidate if fields == list(Candidate._fields) else namedtuple('Row', fields)
+        columns = [decode_column(self.columns[:, i], vocabulary) for i, vocabulary in enumerate(self.vocabularies)]
+        return [row_type(*values) for values in zip(*columns, decode_column(self.labels, self.label_values))]
+
+
 # Klasse für Blätter im Entscheidungsbaum
 class Leaf(NamedTuple):
     value: Any
@@ -253,83 +457,305 @@ def classify(tree: DecisionTree, input: Any) -> Any:
 # Funktion zur Erstellung eines Entscheidungsbaums mit dem ID3-Algorithmus
 def build_tree_id3(inputs: List[Any], split_attributes: List[str], target_attribute: str) -> DecisionTree:
     """Generiert mit dem ID3-Algorithmus einen Entscheidungsbaum aus den Inputs"""
-    # Zähle die Häufigkeit der Zielattribute
-    label_counts = Counter(getattr(input, target_attribute) for input in inputs)
-    most_common_label = label_counts.most_common(1)[0][0]
-    # Falls es nur ein einziges Label gibt, gib dieses zurück
-    if len(label_counts) == 1:
-        return Leaf(most_common_label)
-    # Falls keine Attribute mehr zum Aufteilen übrig sind, gib das häufigste Label zurück
-    if not split_attributes:
+    # Die Inputs werden einmal spaltenweise kodiert, der Aufbau arbeitet nur noch auf dem Dataset
+    return build_tree_dataset(Dataset.from_inputs(inputs, split_attributes, target_attribute))
+
+
+# Funktion zur Bestimmung des häufigsten Labels
+def most_common_code(labels: np.ndarray, label_count: int) -> tuple[int, int]:
+    """
+    Liefert das häufigste Label und die Anzahl verschiedener Labels.
+
+    Bei Gleichstand gewinnt wie bei Counter.most_common das Label, das zuerst vorkommt.
+
+    >>> most_common_code(np.array([1, 0, 0, 1, 2]), 3)
+    (1, 3)
+    """
+    counts = np.bincount(labels, minlength=label_count)
+    tied = counts == counts.max()
+    return int(labels[np.argmax(tied[labels])]), int(np.count_nonzero(counts))
+
+
+# Funktion zur Erstellung eines Entscheidungsbaums aus einem Dataset
+def build_tree_dataset(data: Dataset, rows: Optional[np.ndarray] = None,
+                       split_attributes: Optional[List[int]] = None) -> DecisionTree:
+    """
+    Generiert wie build_tree_id3 einen Entscheidungsbaum, aber auf einem spaltenweise kodierten Dataset.
+
+    Pro Knoten werden die Kontingenztafeln aller noch offenen Attribute in einem Durchlauf über
+    die Zeilen des Knotens gezählt, statt die Eingaben für jedes Attribut neu zu partitionieren.
+
+    Parameters:
+    data (Dataset): Die Trainingsdaten.
+    rows (Optional[np.ndarray]): Die Indizes der Zeilen, aus denen dieser Teilbaum gebaut wird, sonst alle.
+    split_attributes (Optional[List[int]]): Die Spalten, nach denen noch aufgeteilt werden darf, sonst alle.
+
+    Returns:
+    DecisionTree: Der Entscheidungsbaum mit den ursprünglichen Werten als Schlüsseln.
+    """
+    rows = np.arange(len(data)) if rows is None else rows
+    split_attributes = list(range(len(data.attributes))) if split_attributes is None else split_attributes
+    node_labels = data.labels[rows]
+    most_common, label_count = most_common_code(node_labels, len(data.label_values))
+    most_common_label = data.label_values[most_common]
+    # Falls es nur ein einziges Label gibt oder keine Attribute mehr übrig sind, gib das häufigste Label zurück
+    if label_count == 1 or not split_attributes:
         return Leaf(most_common_label)
 
-    # Sonst teile nach dem besten Attribut auf:
-    def split_entropy(attribute: str) -> float:
-        """Hilfsfunktion zum Finden des besten Attributs"""
-        return partition_entropy_by(inputs, attribute, target_attribute)
+    # Sonst teile nach dem Attribut mit der kleinsten Entropie auf. Rundungsfehler hängen von der Reihenfolge
+    # der Summanden ab, deshalb zählen Entropien innerhalb von ENTROPY_TOLERANCE als gleich und das erste gewinnt
+    tables = contingency_tables(data.columns[np.ix_(rows, split_attributes)], node_labels,
+                                [len(data.vocabularies[a]) for a in split_attributes], len(data.label_values))
+    entropies = [partition_entropy_from_counts(table) for table in tables]
+    best = next(i for i, value in enumerate(entropies) if value <= min(entropies) + ENTROPY_TOLERANCE)
+    best_attribute = data.attributes[split_attributes[best]]
+    new_attributes = split_attributes[:best] + split_attributes[best + 1:]
 
-    best_attribute = min(split_attributes, key=split_entropy)
-    partitions = partition_by(inputs, best_attribute)
-    new_attributes = [a for a in split_attributes if a != best_attribute]
     # Unterbäume rekursiv aufbauen
-    subtrees = {attribute_value: build_tree_id3(subset,
-                                                new_attributes,
-                                                target_attribute)
-                for attribute_value, subset in partitions.items()}
+    subtrees = {attribute_value: build_tree_dataset(data, subset, new_attributes)
+                for attribute_value, subset in data.partition(best_attribute, rows).items()}
     return Split(best_attribute, subtrees, default_value=most_common_label)
 
 
-# Hauptfunktion zur Vorhersage mit einem Entscheidungsbaum
-def predict_tree():
-    parser = argparse.ArgumentParser(description='Predict values using a decision tree.')
-    parser.add_argument('training_file', help='CSV file with training data')
-    parser.add_argument('predict_file', help='CSV file with data to predict')
-    parser.add_argument('output_file', help='CSV file to save predictions')
-    args = parser.parse_args()
+# Funktion zur Klassifizierung aller Zeilen eines Datasets
+def classify_dataset(tree: DecisionTree, data: Dataset) -> List[Any]:
+    """
+    Klassifiziert wie classify jede Zeile des Datasets, aber knotenweise statt zeilenweise.
 
-    # Lese Trainingsdaten ein
-    training_data = readfile(args.training_file)
+    Jeder Knoten bekommt die Indizes der Zeilen, die ihn erreichen, und verteilt sie mit
+    Dataset.partition auf seine Unterbäume; Zeilen mit unbekanntem Wert bekommen default_value.
 
-    # Hole Attributnamen aus dem ersten Datensatz
-    if not training_data:
-        print("Fehler: Trainingsdatei enthält keine Daten")
-        sys.exit(1)
+    >>> tree = Split('sprache', {'Java': Leaf(True), 'C': Leaf(False)}, default_value=True)
+    >>> data = Dataset.from_inputs([Candidate('a', True, False, sprache, None) for sprache in ['C', 'Go', 'Java']],
+    ...                            ['sprache'], 'erfolgreich')
+    >>> classify_dataset(tree, data)
+    [False, True, True]
+    """
+    predictions = np.empty(len(data), dtype=object)
+    stack = [(tree, np.arange(len(data)))]
+    while stack:
+        node, rows = stack.pop()
+        if isinstance(node, Leaf):
+            predictions[rows] = node.value
+            continue
+        for value, subset in data.partition(node.attribute, rows).items():
+            if value in node.subtrees:
+                stack.append((node.subtrees[value], subset))
+            else:
+                predictions[subset] = node.default_value
+    return predictions.tolist()
+
+
+# Klasse für einen in flache Arrays übersetzten Entscheidungsbaum
+class CompiledTree(NamedTuple):
+    attributes: List[str]  # Attribute, nach denen der Baum aufteilt
+    vocabularies: List[List[Any]]  # Die Schlüssel der Unterbäume je Attribut, ihr Index ist der Code
+    feature: np.ndarray  # feature[knoten] ist der Index des Attributs, -1 bei Blättern
+    children: np.ndarray  # children[knoten, code] ist der Unterbaum, die letzte Spalte der für unbekannte Werte
+    leaf_value: np.ndarray  # leaf_value[knoten] ist der Index des Werts eines Blatts in values
+    values: List[Any]  # Die Werte der Blätter
+    depth: int  # Anzahl der Splits auf dem längsten Weg von der Wurzel zu einem Blatt
+
+
+# Funktion zur Übersetzung eines Entscheidungsbaums in flache Arrays
+def compile_tree(tree: DecisionTree) -> CompiledTree:
+    """
+    Übersetzt einen Entscheidungsbaum in parallele Arrays für predict_compiled.
+
+    Jeder Knoten bekommt eine Nummer, die Wurzel die 0. default_value eines Splits wird zu
+    einem eigenen Blatt, das in der letzten Spalte von children steht. Blätter zeigen in children
+    auf sich selbst, so bleibt eine Zeile, die ein Blatt erreicht hat, bei jedem weiteren Schritt dort.
 
-    attributes = list(training_data[0]._fields)
-    target_attribute = attributes[-1]
-    split_attributes = attributes[:-1]
+    >>> tree = Split('sprache', {'Java': Leaf(True), 'C': Leaf(False)}, default_value=True)
+    >>> compiled = compile_tree(tree)
+    >>> compiled.feature.tolist(), compiled.children.tolist(), compiled.values, compiled.depth
+    ([0, -1, -1], [[1, 2, 1], [1, 1, 1], [2, 2, 2]], [True, False], 1)
+    """
+    attributes: Dict[str, int] = {}
+    codes: List[Dict[Any, int]] = []
+    values: Dict[Any, int] = {}
+    leaves: Dict[Any, int] = {}  # Ein gemeinsames Blatt pro Wert
+    nodes: List[tuple[int, Dict[int, int], int, int]] = []  # (Attribut, Code -> Kind, Standardkind, Wert)
+
+    def depth(node: DecisionTree) -> int:
+        if isinstance(node, Leaf):
+            return 0
+        return 1 + max(depth(subtree) for subtree in node.subtrees.values())
+
+    def add(node: DecisionTree) -> int:
+        if isinstance(node, Leaf):
+            if node.value not in leaves:
+                leaves[node.value] = len(nodes)
+                nodes.append((-1, {}, 0, values.setdefault(node.value, len(values))))
+            return leaves[node.value]
+        if node.attribute not in attributes:
+            attributes[node.attribute] = len(attributes)
+            codes.append({})
+        attribute = attributes[node.attribute]
+        index = len(nodes)
+        nodes.append((attribute, {}, 0, 0))
+        children = {codes[attribute].setdefault(key, len(codes[attribute])): add(subtree)
+                    for key, subtree in node.subtrees.items()}
+        nodes[index] = (attribute, children, add(Leaf(node.default_value)), 0)
+        return index
+
+    add(tree)
+    width = max((len(c) for c in codes), default=0) + 1
+    feature = np.array([attribute for attribute, _, _, _ in nodes], dtype=np.int32)
+    children = np.zeros((len(nodes), width), dtype=np.int32)
+    for i, (attribute, subtrees, default, _) in enumerate(nodes):
+        if attribute >= 0:
+            children[i, :] = default
+            children[i, list(subtrees)] = list(subtrees.values())
+        else:
+            children[i, :] = i
+    leaf_value = np.array([value for _, _, _, value in nodes], dtype=np.int32)
+    return CompiledTree(list(attributes), [list(c) for c in codes], feature, children, leaf_value, list(values),
+                        depth(tree))
+
+
+# Funktion zur Vorhersage aller Zeilen eines Datasets mit einem übersetzten Baum
+def predict_compiled(compiled: CompiledTree, data: Dataset) -> List[Any]:
+    """
+    Liefert dieselben Vorhersagen wie classify_dataset, aber ohne den Baum zu durchlaufen.
 
-    # Erstelle Entscheidungsbaum
-    tree = build_tree_id3(training_data, split_attributes, target_attribute)
+    Die Spalten des Datasets werden zuerst auf die Codes des übersetzten Baums umgerechnet
+    (unbekannte Werte auf die letzte Spalte von children). Danach rücken alle Zeilen depth-mal
+    gemeinsam eine Ebene weiter, jeder Schritt sind drei Arrayzugriffe über alle Zeilen.
 
-    # Lese Vorhersagedaten ein
-    predict_data = readfile(args.predict_file)
+    >>> tree = Split('sprache', {'Java': Leaf(True), 'C': Leaf(False)}, default_value=True)
+    >>> data = Dataset.from_inputs([Candidate('a', True, False, sprache, None) for sprache in ['C', 'Go', 'Java']],
+    ...                            ['sprache'], 'erfolgreich')
+    >>> predict_compiled(compile_tree(tree), data)
+    [False, True, True]
+    """
+    width = compiled.children.shape[1]
+    codes = np.empty((len(data), len(compiled.attributes)), dtype=np.int32)
+    for i, (attribute, vocabulary) in enumerate(zip(compiled.attributes, compiled.vocabularies)):
+        index = {value: code for code, value in enumerate(vocabulary)}
+        translation = np.array([index.get(value, width - 1) for value in data.vocabulary(attribute)],
+                               dtype=np.int32)
+        codes[:, i] = translation[data.column(attribute)]
 
-    # Führe Vorhersagen durch
-    results = []
-    for data_point in predict_data:
-        # Erstelle neuen Datensatz mit der Vorhersage
-        prediction = classify(tree, data_point)
+    # Blätter haben kein Attribut, für sie wird irgendeine Spalte gelesen, ihr Kind sind sie selbst
+    feature = np.maximum(compiled.feature, 0)
+    children = compiled.children.ravel()
+    rows = np.arange(len(data))
+    node = np.zeros(len(data), dtype=np.intp)
+    for _ in range(compiled.depth):
+        node = children[node * width + codes[rows, feature[node]]]
+    return decode_column(compiled.leaf_value[node], compiled.values)
 
-        # Hole alle Felder als Dictionary
-        data_dict = data_point._asdict()
 
-        # Aktualisiere das Zielattribut mit der Vorhersage
-        data_dict[target_attribute] = prediction
+# Übersetzter Baum eines Arbeitsprozesses von predict_stream, gesetzt von _init_worker
+_worker_tree: Optional[CompiledTree] = None
 
-        results.append(data_dict)
 
-    # Schreibe Ergebnisse in Ausgabedatei
-    with open(args.output_file, 'w', newline='') as file:
-        # Verwende denselben Delimiter wie in den Originaldateien
-        writer = csv.writer(file, delimiter=';')
+def _init_worker(compiled: CompiledTree) -> None:
+    global _worker_tree
+    _worker_tree = compiled
+
+
+def _predict_worker(fieldnames: List[str], lines: List[str]) -> str:
+    return predict_lines(_worker_tree, fieldnames, lines)
+
+
+# Funktion zur Vorhersage eines Blocks von CSV-Zeilen
+def predict_lines(compiled: CompiledTree, fieldnames: List[str], lines: List[str]) -> str:
+    """
+    Liest einen Block von CSV-Zeilen ohne Header, sagt das Zielattribut vorher und liefert die
+    Ausgabezeilen als CSV-Text, im selben Format wie predict_tree sie schreibt.
+
+    >>> compiled = compile_tree(Split('sprache', {'Java': Leaf(True)}, default_value=False))
+    >>> predict_lines(compiled, ['name', 'puenktlich', 'htl', 'sprache', 'erfolgreich'],
+    ...               ['Anna;ja;nein;Java;\\n', 'Bert;nein;ja;C;ja\\n'])
+    'A;True;False;Java;True\\r\\nB;False;True;C;False\\r\\n'
+    """
+    fields = list(Candidate._fields)
+    chunk = [parse_candidate(row) for row in csv.DictReader(lines, fieldnames=fieldnames, delimiter=';')]
+    predictions = predict_compiled(compiled, Dataset.from_inputs(chunk, fields[:-1], fields[-1]))
+    output = io.StringIO()
+    csv.writer(output, delimiter=';').writerows((*candidate[:-1], prediction)
+                                                for candidate, prediction in zip(chunk, predictions))
+    return output.getvalue()
+
+
+# Funktion zur Vorhersage einer CSV-Datei in Blöcken
+def predict_stream(compiled: CompiledTree, predict_file: str, output_file: str, chunk_size: int = CHUNK_SIZE,
+                   processes: Optional[int] = None) -> None:
+    """
+    Sagt das Zielattribut für jede Zeile von predict_file vorher und schreibt die Ergebnisse fortlaufend.
+
+    Die Datei wird in Blöcken von chunk_size Zeilen gelesen, jeder Block wird vorhergesagt und
+    geschrieben, bevor der nächste gelesen wird; der Speicherbedarf hängt daher nicht von der Größe
+    der Datei ab. Die Blöcke werden als Textzeilen geteilt, Felder dürfen also keine Zeilenumbrüche
+    enthalten.
+
+    Mit processes übernimmt ein Pool aus so vielen Prozessen das Einlesen, Vorhersagen und
+    Formatieren der Blöcke. Es sind höchstens 2 * processes Blöcke gleichzeitig unterwegs, und sie
+    werden in der Reihenfolge der Eingabe geschrieben.
+
+    Parameters:
+    compiled (CompiledTree): Der übersetzte Entscheidungsbaum.
+    predict_file (str): Die CSV-Datei mit den vorherzusagenden Zeilen.
+    output_file (str): Die CSV-Datei für die Vorhersagen.
+    chunk_size (int): Zeilen pro Block, mindestens 1.
+    processes (Optional[int]): Anzahl der Prozesse, mindestens 1; None sagt im eigenen Prozess vorher.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size muss mindestens 1 sein, nicht {chunk_size}")
+    if processes is not None and processes < 1:
+        raise ValueError(f"processes muss mindestens 1 sein, nicht {processes}")
+    with open(predict_file, 'r') as source, open(output_file, 'w', newline='') as target:
+        fieldnames = next(csv.reader(source, delimiter=';'), [])
+        chunks = iter(lambda: list(islice(source, chunk_size)), [])
+        csv.writer(target, delimiter=';').writerow(Candidate._fields)
+
+        if not processes:
+            for lines in chunks:
+                target.write(predict_lines(compiled, fieldnames, lines))
+            return
+
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(compiled,)) as pool:
+            pending = deque()
+            for lines in chunks:
+                pending.append(pool.submit(_predict_worker, fieldnames, lines))
+                if len(pending) >= 2 * processes:
+                    target.write(pending.popleft().result())
+            while pending:
+                target.write(pending.popleft().result())
+
+
+# Funktion zum Prüfen positiver ganzzahliger Kommandozeilenargumente
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"muss mindestens 1 sein, nicht {number}")
+    return number
+
+
+# Hauptfunktion zur Vorhersage mit einem Entscheidungsbaum
+def predict_tree():
+    parser = argparse.ArgumentParser(description='Predict values using a decision tree.')
+    parser.add_argument('training_file', help='CSV file with training data')
+    parser.add_argument('predict_file', help='CSV file with data to predict')
+    parser.add_argument('output_file', help='CSV file to save predictions')
+    parser.add_argument('-c', '--chunk-size', type=positive_int, default=CHUNK_SIZE, help='rows predicted at once')
+    parser.add_argument('-p', '--processes', type=positive_int, nargs='?', const=os.cpu_count(),
+                        help='predict the chunks in a pool of this many processes (default: one per core)')
+    args = parser.parse_args()
+
+    # Lese Trainingsdaten spaltenweise ein
+    training_data = Dataset.read_csv(args.training_file)
+    if not len(training_data):
+        print("Fehler: Trainingsdatei enthält keine Daten")
+        sys.exit(1)
 
-        # Schreibe Header-Zeile
-        writer.writerow(attributes)
+    # Erstelle Entscheidungsbaum und übersetze ihn für die Vorhersage
+    compiled = compile_tree(build_tree_dataset(training_data))
 
-        # Schreibe Datenzeilen
-        for data_dict in results:
-            writer.writerow([data_dict[attr] for attr in attributes])
+    # Sage die Vorhersagedatei blockweise vorher, das Zielattribut wird durch die Vorhersage ersetzt
+    predict_stream(compiled, args.predict_file, args.output_file, args.chunk_size, args.processes)
 
     print(f"Vorhersagen gespeichert in {args.output_file}")
 
@@ -1,12 +1,20 @@
 __author__ = "Hanno Postl"
-__version__ = "1.1"
+__version__ = "2.0"
 __status__ = "Finished"
 
+import sys
 from argparse import ArgumentParser
 from time import sleep, perf_counter_ns
+from typing import Callable, Optional
 from xml.etree.ElementPath import prepare_self
 from xml.sax import default_parser_list
 
+from anzeige import Anzeige
+from distanzfeld import UNERREICHBAR, Distanzfeld, printWeg
+from frontsuche import alleSuchenFront
+from kreuzungen import alleSuchenKreuzungen
+from parallel import alleSuchenParallel
+from raster import AUSGANG, BESUCHT, FREI, WAND, Raster, alleSuchenRaster
 
 def fromStrings(strings: list[str]) -> list[list[int]]:
     return [[ord(c) for c in line] for line in [str.strip() for str in strings]]
@@ -32,38 +40,161 @@ def suchen(zeile: int, spalte: int, lab: list[list[int]], print: bool = False, d
         printLab(lab)
         sleep(delay / 1000)
 
-    hit: bool = (suchen(zeile, spalte + 1, lab) or
-          suchen(zeile + 1, spalte, lab) or
-          suchen(zeile, spalte - 1, lab) or
-          suchen(zeile - 1, spalte, lab))
+    hit: bool = (suchen(zeile, spalte + 1, lab, print, delay) or
+          suchen(zeile + 1, spalte, lab, print, delay) or
+          suchen(zeile, spalte - 1, lab, print, delay) or
+          suchen(zeile - 1, spalte, lab, print, delay))
 
     lab[zeile][spalte] = ord(' ')
 
     return hit
 
-def alleSuchen(zeile: int, spalte: int, lab: list[list[int]], print: bool = False, delay: int = 500) -> int:
+def alleSuchen(zeile: int, spalte: int, lab: list[list[int]], print: bool = False, delay: int = 500,
+               loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None) -> int:
     if lab[zeile][spalte] == ord('A'):
+        if loesung:
+            loesung()
         return 1
 
     if lab[zeile][spalte] == ord('#') or lab[zeile][spalte] == ord('.'):
         return 0
 
     lab[zeile][spalte] = ord('.')
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + 1
 
     if print:
         printLab(lab)
         sleep(delay/1000)
 
-    hit: int = (alleSuchen(zeile, spalte + 1, lab, print, delay) +
-          alleSuchen(zeile + 1, spalte, lab, print, delay) +
-          alleSuchen(zeile, spalte - 1, lab, print, delay) +
-          alleSuchen(zeile - 1, spalte, lab, print, delay))
+    hit: int = (alleSuchen(zeile, spalte + 1, lab, print, delay, loesung, stats) +
+          alleSuchen(zeile + 1, spalte, lab, print, delay, loesung, stats) +
+          alleSuchen(zeile, spalte - 1, lab, print, delay, loesung, stats) +
+          alleSuchen(zeile - 1, spalte, lab, print, delay, loesung, stats))
 
     lab[zeile][spalte] = ord(' ')
 
     return hit
 
+def nachbarn(zeile: int, spalte: int) -> tuple[tuple[int, int], ...]:
+    """Nachbarfelder in der Reihenfolge von suchen/alleSuchen: rechts, unten, links, oben."""
+    return (zeile, spalte + 1), (zeile + 1, spalte), (zeile, spalte - 1), (zeile - 1, spalte)
+
+def alleSuchenIterativ(zeile: int, spalte: int, lab: list[list[int]], print: bool = False, delay: int = 500,
+                       loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None) -> int:
+    """
+    Zählt wie alleSuchen alle Wege zu einem Ausgang, aber ohne Rekursion.
+
+    Statt eines Funktionsaufrufs pro Feld liegt für jedes Feld des aktuellen Weges ein
+    Eintrag auf einem expliziten Stack: das Feld selbst und ein Iterator über die noch nicht
+    probierten Richtungen. Felder werden wie bei alleSuchen direkt im Labyrinth markiert und
+    beim Zurückgehen wieder freigegeben, dadurch gibt es kein Rekursionslimit mehr.
+    Die Zahl der besuchten Felder wird wie bei alleSuchen zu stats["knoten"] addiert.
+
+    >>> alleSuchenIterativ(1, 1, fromStrings(["#####", "#   #", "# # #", "#  A#", "#####"]))
+    2
+    """
+    feld: int = lab[zeile][spalte]
+    if feld == AUSGANG:
+        return 1
+    if feld == WAND or feld == BESUCHT:
+        return 0
+
+    lab[zeile][spalte] = BESUCHT
+    weg: list[tuple[int, int]] = [(zeile, spalte)]
+    richtungen = [iter(nachbarn(zeile, spalte))]
+    hits: int = 0
+    knoten: int = 1
+
+    while richtungen:
+        for z, s in richtungen[-1]:
+            feld = lab[z][s]
+            if feld == AUSGANG:
+                hits += 1
+                if loesung:
+                    loesung()
+            elif feld != WAND and feld != BESUCHT:
+                lab[z][s] = BESUCHT
+                weg.append((z, s))
+                richtungen.append(iter(nachbarn(z, s)))
+                knoten += 1
+                if print:
+                    printLab(lab)
+                    sleep(delay / 1000)
+                break
+        else:
+            # Alle Richtungen probiert: Feld wieder freigeben und zurückgehen
+            richtungen.pop()
+            z, s = weg.pop()
+            lab[z][s] = FREI
+
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + knoten
+    return hits
+
+def suchenIterativ(zeile: int, spalte: int, lab: list[list[int]], print: bool = False, delay: int = 1) -> bool:
+    """
+    Prüft wie suchen, ob es einen Weg zu einem Ausgang gibt, aber ohne Rekursion.
+
+    >>> suchenIterativ(1, 1, fromStrings(["#####", "#   #", "### #", "#  A#", "#####"]))
+    True
+    >>> suchenIterativ(1, 1, fromStrings(["#####", "#   #", "#####", "#  A#", "#####"]))
+    False
+    """
+    feld: int = lab[zeile][spalte]
+    if feld == AUSGANG:
+        return True
+    if feld == WAND or feld == BESUCHT:
+        return False
+
+    lab[zeile][spalte] = BESUCHT
+    weg: list[tuple[int, int]] = [(zeile, spalte)]
+    richtungen = [iter(nachbarn(zeile, spalte))]
+    hit: bool = False
+
+    while richtungen and not hit:
+        for z, s in richtungen[-1]:
+            feld = lab[z][s]
+            if feld == AUSGANG:
+                hit = True
+                break
+            elif feld != WAND and feld != BESUCHT:
+                lab[z][s] = BESUCHT
+                weg.append((z, s))
+                richtungen.append(iter(nachbarn(z, s)))
+                if print:
+                    printLab(lab)
+                    sleep(delay / 1000)
+                break
+        else:
+            richtungen.pop()
+            z, s = weg.pop()
+            lab[z][s] = FREI
+
+    # Markierungen des gefundenen Weges wieder entfernen
+    for z, s in weg:
+        lab[z][s] = FREI
+
+    return hit
+
+def bildQuelle(lab) -> Callable[[], list[str]]:
+    """Liefert für die Anzeige eine Funktion, die den aktuellen Zustand von lab (Liste oder Raster) als Zeilen liest."""
+    if isinstance(lab, Raster):
+        return lab.zeilen
+    return lambda: ["".join([chr(c) for c in row]) for row in lab]
+
+def unveraendert(lab: list[list[int]]) -> list[list[int]]:
+    return lab
 
+# Engine-Name -> (Umwandlung des eingelesenen Labyrinths, Suche)
+ENGINES = {
+    "rekursiv": (unveraendert, alleSuchen),
+    "iterativ": (unveraendert, alleSuchenIterativ),
+    "raster": (Raster.ausLab, alleSuchenRaster),
+    "kreuzungen": (Raster.ausLab, alleSuchenKreuzungen),
+    "front": (Raster.ausLab, alleSuchenFront),
+    "parallel": (Raster.ausLab, alleSuchenParallel),
+}
 
 
 if __name__ == "__main__":
@@ -71,14 +202,39 @@ if __name__ == "__main__":
     parser.add_argument("filename", type=str, help="file containing the labyrinth to solve")
     parser.add_argument("-x", "--xstart", type=int, help="x-coordinae to start")
     parser.add_argument("-y", "--ystart", type=int, help="y-coordinae to start")
-    parser.add_argument("-p", "--print", help="print output of every soslution", action='store_true')
+    parser.add_argument("-p", "--print", help="show the search live in the terminal", action='store_true')
+    parser.add_argument("-l", "--loesungen", help="with --print: show only the found solutions", action='store_true')
+    parser.add_argument("-f", "--fps", type=float, default=30, help="with --print: maximum frames per second")
     parser.add_argument("-t", "--time", help="print total calculation time (in milliseconds)", action='store_true')
-    parser.add_argument("-d", "--delay", type=int, default=500, help="delay after printing a solution (in milliseconds)")
+    parser.add_argument("-d", "--delay", type=int, default=500, help="with --loesungen: minimum time a solution stays visible (in milliseconds)")
+    parser.add_argument("-e", "--engine", choices=ENGINES.keys(), default="raster", help="search engine to count the ways")
+    parser.add_argument("-k", "--kuerzester", help="print the shortest way instead of counting all ways, "
+                        "reads 'x y' start pairs from stdin if no start is given", action='store_true')
 
     args = parser.parse_args()
-    lab: list[list[int]] = labFromFile(args.filename)
+    if args.kuerzester:
+        feld = Distanzfeld(Raster.ausLab(labFromFile(args.filename)))
+        if args.xstart is not None and args.ystart is not None:
+            starts = [(args.xstart, args.ystart)]
+        else:
+            starts = [tuple(map(int, zeile.split())) for zeile in sys.stdin if zeile.strip()]
+        for xstart, ystart in starts:
+            distanz = feld.distanz(ystart, xstart)
+            if distanz == UNERREICHBAR:
+                print(f"Kein Weg von ({xstart}, {ystart})")
+                continue
+            print(f"Kürzester Weg von ({xstart}, {ystart}): {distanz} Schritte")
+            if args.print:
+                printWeg(feld.raster, feld.weg(ystart, xstart))
+        sys.exit(0)
+
+    vorbereiten, suche = ENGINES[args.engine]
+    lab = vorbereiten(labFromFile(args.filename))
+    anzeige = Anzeige(bildQuelle(lab), args.fps, args.loesungen, args.delay / 1000).start() if args.print else None
     start_time = perf_counter_ns()
-    hits: int = alleSuchen(args.ystart,args.xstart,lab,args.print,args.delay)
+    hits: int = suche(args.ystart,args.xstart,lab,loesung=anzeige.loesung if anzeige else None)
     end_time = perf_counter_ns()
-    print(f"Anzahl Wege: {hits}"
-          f"{f" in {(end_time - start_time)/1000} Millisekunden" if args.time else ''}")
+    if anzeige:
+        anzeige.stopp()
+    dauer: float = (end_time - start_time) / 1_000_000
+    print(f"Anzahl Wege: {hits}" + (f" in {dauer:.3f} Millisekunden" if args.time else ""))
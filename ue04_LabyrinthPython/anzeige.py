@@ -0,0 +1,120 @@
+__author__ = "Hanno Postl"
+__version__ = "1.0"
+__status__ = "Finished"
+
+import sys
+import threading
+from time import monotonic
+from typing import Callable, Optional, TextIO
+
+# ANSI-Steuerzeichen: Bildschirm löschen, Cursor positionieren (1-basiert), Cursor aus/ein
+LOESCHEN: str = "\x1b[2J"
+CURSOR_AUS: str = "\x1b[?25l"
+CURSOR_EIN: str = "\x1b[?25h"
+
+
+def cursor(zeile: int, spalte: int) -> str:
+    """ANSI-Sequenz, die den Cursor auf (zeile, spalte) des Labyrinths setzt (0-basiert)."""
+    return f"\x1b[{zeile + 1};{spalte + 1}H"
+
+
+def unterschiede(vorher: list[str], jetzt: list[str]) -> str:
+    """
+    ANSI-Ausgabe, die den Bildschirm von vorher auf jetzt bringt, nur die geänderten Felder werden neu geschrieben.
+
+    Nebeneinanderliegende Änderungen in einer Zeile werden mit einer einzigen Cursor-Bewegung geschrieben.
+
+    >>> unterschiede(["# .#", "#  A"], ["#..#", "#. A"])
+    '\\x1b[1;2H.\\x1b[2;2H.'
+    >>> unterschiede(["#  #"], ["#..#"])
+    '\\x1b[1;2H..'
+    """
+    ausgabe: list[str] = []
+    for z, (alt, neu) in enumerate(zip(vorher, jetzt)):
+        if alt == neu:
+            continue
+        s = 0
+        while s < len(neu):
+            if s < len(alt) and alt[s] == neu[s]:
+                s += 1
+                continue
+            ende = s
+            while ende < len(neu) and (ende >= len(alt) or alt[ende] != neu[ende]):
+                ende += 1
+            ausgabe.append(cursor(z, s) + neu[s:ende])
+            s = ende
+    return "".join(ausgabe)
+
+
+class Anzeige:
+    """
+    Zeigt den Fortschritt einer Suche im Terminal an, ohne die Suche selbst aufzuhalten.
+
+    Ein eigener Thread liest höchstens fps-mal pro Sekunde den aktuellen Zustand über quelle
+    und schreibt nur die seit dem letzten Bild geänderten Felder mit ANSI-Cursorbewegungen.
+    Die Suche markiert ihre Felder wie gewohnt und wartet nie auf die Ausgabe.
+
+    Mit nurLoesungen werden statt des laufenden Zustands nur gefundene Wege gezeigt: die Suche
+    ruft bei jedem Treffer loesung() auf, gespeichert wird aber höchstens ein Weg pro halte
+    Sekunden (mindestens ein Bild lang), damit die Suche nicht bei jedem Treffer kopieren muss.
+    """
+
+    def __init__(self, quelle: Callable[[], list[str]], fps: float = 30, nurLoesungen: bool = False,
+                 halte: float = 0, ausgabe: TextIO = sys.stdout) -> None:
+        self.quelle = quelle
+        self.intervall: float = 1 / fps
+        self.nurLoesungen: bool = nurLoesungen
+        self.halte: float = max(halte, self.intervall)
+        self.ausgabe: TextIO = ausgabe
+        self.loesungen: int = 0
+
+        self._bild: list[str] = []
+        self._loesung: Optional[list[str]] = None
+        self._letzteLoesung: float = float("-inf")
+        self._stopp = threading.Event()
+        self._thread = threading.Thread(target=self._zeichnen, daemon=True)
+
+    def start(self) -> "Anzeige":
+        self._bild = self.quelle()
+        self.ausgabe.write(LOESCHEN + CURSOR_AUS + cursor(0, 0) + "\n".join(self._bild))
+        self.ausgabe.flush()
+        self._thread.start()
+        return self
+
+    def loesung(self) -> None:
+        """Von der Suche bei jedem gefundenen Weg aufzurufen."""
+        self.loesungen += 1
+        if self.nurLoesungen:
+            jetzt = monotonic()
+            if jetzt - self._letzteLoesung >= self.halte:
+                self._letzteLoesung = jetzt
+                self._loesung = self.quelle()
+
+    def stopp(self) -> None:
+        """Beendet den Thread, zeichnet ein letztes Bild und setzt den Cursor unter das Labyrinth."""
+        self._stopp.set()
+        self._thread.join()
+        self._aktualisieren()
+        self.ausgabe.write(cursor(len(self._bild), 0) + CURSOR_EIN)
+        self.ausgabe.flush()
+
+    def __enter__(self) -> "Anzeige":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stopp()
+
+    def _zeichnen(self) -> None:
+        while not self._stopp.wait(self.intervall):
+            self._aktualisieren()
+
+    def _aktualisieren(self) -> None:
+        if self.nurLoesungen:
+            bild, self._loesung = self._loesung, None
+            if bild is None:
+                return
+        else:
+            bild = self.quelle()
+        self.ausgabe.write(unterschiede(self._bild, bild))
+        self.ausgabe.flush()
+        self._bild = bild
@@ -0,0 +1,131 @@
+__author__ = "Hanno Postl"
+__version__ = "2.0"
+__status__ = "Finished"
+
+import json
+import platform
+import statistics
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter_ns
+from typing import Optional
+
+from Labyrinth import ENGINES, fromStrings, labFromFile
+from generator import erzeugeLabyrinth
+
+
+def lauf(engine: str, lab: list[list[int]], zeile: int, spalte: int) -> tuple[int, int, Optional[int]]:
+    """Führt eine Engine einmal auf einer Kopie des Labyrinths aus, liefert Wege, Laufzeit in ns und besuchte Knoten."""
+    vorbereiten, suche = ENGINES[engine]
+    daten = vorbereiten([list(reihe) for reihe in lab])
+    stats: dict[str, int] = {}
+    start = perf_counter_ns()
+    hits = suche(zeile, spalte, daten, stats=stats)
+    return hits, perf_counter_ns() - start, stats.get("knoten")
+
+
+def spitzenspeicher(engine: str, lab: list[list[int]], zeile: int, spalte: int) -> int:
+    """Höchster Speicherbedarf eines Laufes laut tracemalloc in Bytes (nur der eigene Prozess)."""
+    tracemalloc.start()
+    try:
+        lauf(engine, lab, zeile, spalte)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def quantil(werte: list[float], anteil: float) -> float:
+    """
+    Quantil mit linearer Interpolation zwischen den sortierten Werten.
+
+    >>> quantil([1, 2, 3, 4, 5], 0.5), quantil([1, 2, 3, 4, 5], 0.95)
+    (3.0, 4.8)
+    """
+    werte = sorted(werte)
+    position = (len(werte) - 1) * anteil
+    unten = int(position)
+    oben = min(unten + 1, len(werte) - 1)
+    return werte[unten] + (werte[oben] - werte[unten]) * (position - unten)
+
+
+def messe(engine: str, lab: list[list[int]], zeile: int, spalte: int, wiederholungen: int,
+          zeitlimit: float) -> dict:
+    """
+    Misst eine Engine mehrmals und liefert Median und 95%-Quantil der Laufzeit, Knoten und Spitzenspeicher.
+
+    Dauert schon der erste Lauf länger als zeitlimit Sekunden, wird nur dieser eine Lauf verwendet.
+    Der Speicher wird in einem eigenen Lauf gemessen, weil tracemalloc die Laufzeit verfälscht.
+    """
+    try:
+        hits, dauer, knoten = lauf(engine, lab, zeile, spalte)
+    except RecursionError:
+        return {"fehler": "RecursionError"}
+    zeiten = [dauer]
+    if dauer / 1e9 <= zeitlimit:
+        zeiten += [lauf(engine, lab, zeile, spalte)[1] for _ in range(wiederholungen - 1)]
+    ms = [zeit / 1_000_000 for zeit in zeiten]
+    return {
+        "wege": hits,
+        "knoten": knoten,
+        "laeufe": len(ms),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(quantil(ms, 0.95), 3),
+        "peak_kib": round(spitzenspeicher(engine, lab, zeile, spalte) / 1024, 1)
+        if dauer / 1e9 <= zeitlimit else None,
+    }
+
+
+def labyrinthe(groessen: list[int], braids: list[float], seed: int, dateien: bool) -> dict[str, dict]:
+    """Alle Labyrinthe des Benchmarks: die mitgelieferten Dateien und erzeugte mit jeder Größe und Schleifendichte."""
+    ergebnis: dict[str, dict] = {}
+    if dateien:
+        for name in ["l1.txt", "l2.txt", "l3.txt"]:
+            ergebnis[name] = {"lab": labFromFile(name), "groesse": None, "braid": None}
+    for braid in braids:
+        for groesse in groessen:
+            name = f"generiert {groesse}x{groesse} braid {braid}"
+            ergebnis[name] = {"lab": fromStrings(erzeugeLabyrinth(groesse, groesse, seed, braid)),
+                              "groesse": groesse, "braid": braid}
+    return ergebnis
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="benchmark the labyrinth engines and report the results as JSON")
+    parser.add_argument("-g", "--groessen", type=int, nargs="+", default=[21, 41, 81], help="sizes of the generated labyrinths")
+    parser.add_argument("-b", "--braid", type=float, nargs="+", default=[0.0, 0.05], help="dead end removal probabilities")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the labyrinth generator")
+    parser.add_argument("-w", "--wiederholungen", type=int, default=5, help="runs per engine and labyrinth")
+    parser.add_argument("-z", "--zeitlimit", type=float, default=10, help="seconds after which an engine is not repeated "
+                        "and skipped for larger labyrinths")
+    parser.add_argument("-e", "--engines", nargs="+", choices=ENGINES.keys(), default=list(ENGINES), help="engines to run")
+    parser.add_argument("--ohne-dateien", help="skip l1.txt - l3.txt", action='store_true')
+    parser.add_argument("-o", "--output", type=str, help="write the JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    ergebnisse: list[dict] = []
+    zuLangsam: set[tuple[str, Optional[float]]] = set()
+    for name, eintrag in labyrinthe(args.groessen, args.braid, args.seed, not args.ohne_dateien).items():
+        for engine in args.engines:
+            # Generierte Labyrinthe sind nach Größe sortiert: war eine Engine einmal zu langsam, bleibt sie es
+            if eintrag["groesse"] is not None and (engine, eintrag["braid"]) in zuLangsam:
+                ergebnis = {"fehler": "übersprungen"}
+            else:
+                ergebnis = messe(engine, eintrag["lab"], 1, 1, args.wiederholungen, args.zeitlimit)
+                if ergebnis.get("laeufe", 0) < args.wiederholungen:
+                    zuLangsam.add((engine, eintrag["braid"]))
+            ergebnisse.append({"labyrinth": name, "groesse": eintrag["groesse"], "braid": eintrag["braid"],
+                               "engine": engine, **ergebnis})
+            print(f"{name:<32}{engine:<12}{ergebnis}", file=sys.stderr)
+
+    bericht = {
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "wiederholungen": args.wiederholungen,
+        "ergebnisse": ergebnisse,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(bericht, file, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(bericht, indent=2, ensure_ascii=False))
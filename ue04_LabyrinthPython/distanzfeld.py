@@ -0,0 +1,86 @@
+__author__ = "Hanno Postl"
+__version__ = "1.0"
+__status__ = "Finished"
+
+from array import array
+
+from raster import AUSGANG, BESUCHT, WAND, Raster, printRaster
+
+UNERREICHBAR: int = -1
+
+
+class Distanzfeld:
+    """
+    Kürzeste Entfernung jedes Feldes zum nächsten Ausgang, berechnet mit einer einzigen Breitensuche.
+
+    Die Suche startet gleichzeitig bei allen Ausgängen und läuft rückwärts in das Labyrinth hinein.
+    Entfernungen und Warteschlange sind array('i')-Puffer mit einem Eintrag pro Feld des Rasters,
+    die Warteschlange ist ein einfacher Lese- und Schreibzeiger ohne Verschieben von Elementen.
+    Danach kostet jede Abfrage für einen beliebigen Start nur noch O(1) für die Entfernung bzw.
+    O(Weglänge) für den Weg selbst.
+
+    >>> feld = Distanzfeld(Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"]))
+    >>> feld.distanz(1, 1)
+    4
+    >>> feld.weg(1, 1)
+    [(1, 1), (1, 2), (1, 3), (2, 3), (3, 3)]
+    >>> feld.distanz(2, 2)
+    -1
+    """
+
+    def __init__(self, raster: Raster) -> None:
+        self.raster: Raster = raster
+        daten = raster.daten
+        versaetze = raster.versaetze
+        distanzen = array('i', [UNERREICHBAR]) * len(daten)
+        warteschlange = array('i', bytes(distanzen.itemsize * len(daten)))
+
+        ende: int = 0
+        for index, feld in enumerate(daten):
+            if feld == AUSGANG:
+                distanzen[index] = 0
+                warteschlange[ende] = index
+                ende += 1
+
+        kopf: int = 0
+        while kopf < ende:
+            index = warteschlange[kopf]
+            kopf += 1
+            distanz = distanzen[index] + 1
+            for versatz in versaetze:
+                nachbar = index + versatz
+                feld = daten[nachbar]
+                if distanzen[nachbar] == UNERREICHBAR and feld != WAND and feld != BESUCHT:
+                    distanzen[nachbar] = distanz
+                    warteschlange[ende] = nachbar
+                    ende += 1
+
+        self.distanzen: array = distanzen
+
+    def distanz(self, zeile: int, spalte: int) -> int:
+        """Anzahl Schritte vom Feld (zeile, spalte) zum nächsten Ausgang, UNERREICHBAR ohne Weg."""
+        return self.distanzen[self.raster.index(zeile, spalte)]
+
+    def weg(self, zeile: int, spalte: int) -> list[tuple[int, int]]:
+        """Ein kürzester Weg vom Feld (zeile, spalte) bis einschließlich Ausgang, leer ohne Weg."""
+        distanzen = self.distanzen
+        index = self.raster.index(zeile, spalte)
+        if distanzen[index] == UNERREICHBAR:
+            return []
+
+        weg: list[tuple[int, int]] = [self.raster.koordinaten(index)]
+        while distanzen[index] > 0:
+            index = next(index + versatz for versatz in self.raster.versaetze
+                         if distanzen[index + versatz] == distanzen[index] - 1)
+            weg.append(self.raster.koordinaten(index))
+        return weg
+
+
+def printWeg(raster: Raster, weg: list[tuple[int, int]]):
+    """Gibt das Labyrinth mit dem Weg als '.' markiert aus, ohne das Raster selbst zu verändern."""
+    kopie = Raster.ausStrings(raster.zeilen())
+    for zeile, spalte in weg:
+        index = kopie.index(zeile, spalte)
+        if kopie.daten[index] != AUSGANG:
+            kopie.daten[index] = BESUCHT
+    printRaster(kopie)
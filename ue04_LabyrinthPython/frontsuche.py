@@ -0,0 +1,166 @@
+__author__ = "Hanno Postl"
+__version__ = "1.2"
+__status__ = "Finished"
+
+from collections import defaultdict
+from typing import Callable, Optional
+
+from raster import AUSGANG, BESUCHT, WAND, Raster
+
+GESAETTIGT: int = -1  # Feld hat schon zwei Kanten (liegt mitten im Weg)
+
+
+def sackgassenFuellen(offen: list[list[bool]], start: tuple[int, int], ziel: tuple[int, int]) -> list[list[bool]]:
+    """
+    Füllt alle Sackgassen auf: Ein Feld außer start und ziel mit höchstens einem offenen Nachbarn
+    kann in keinem Weg ohne Wiederholung liegen und wird zur Wand, bis keine solchen Felder mehr übrig sind.
+    In einem perfekten Labyrinth bleibt genau der eine Weg übrig. Das übergebene Gitter bleibt unverändert.
+
+    >>> sackgassenFuellen([[True, True, True], [False, True, False]], (0, 0), (0, 2))
+    [[True, True, True], [False, False, False]]
+    """
+    hoehe, breite = len(offen), len(offen[0])
+    offen = [list(reihe) for reihe in offen]
+
+    def offeneNachbarn(z: int, s: int) -> list[tuple[int, int]]:
+        return [(z + dz, s + ds) for dz, ds in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                if 0 <= z + dz < hoehe and 0 <= s + ds < breite and offen[z + dz][s + ds]]
+
+    stack = [(z, s) for z in range(hoehe) for s in range(breite)]
+    while stack:
+        z, s = stack.pop()
+        if offen[z][s] and (z, s) != start and (z, s) != ziel:
+            nachbarn = offeneNachbarn(z, s)
+            if len(nachbarn) < 2:
+                offen[z][s] = False
+                stack.extend(nachbarn)
+    return offen
+
+
+def zaehleWegeFront(offen: list[list[bool]], start: tuple[int, int], ziel: tuple[int, int],
+                    stats: Optional[dict[str, int]] = None) -> int:
+    """
+    Zählt exakt alle einfachen Wege von start nach ziel über die offenen Felder eines Gitters.
+
+    Frontier-basierte Suche ("simpath"): Die Kanten werden zeilenweise abgearbeitet und für jede
+    Kante wird entschieden, ob sie im Weg liegt. Statt einzelner Wege merkt man sich nur, wie die
+    Felder an der Front (höchstens eine Zeile breit) verbunden sind, und wie viele Teilwege zu
+    diesem Zustand führen. Für jedes Frontfeld steht im Zustand sein "mate": es selbst (noch keine
+    Kante), GESAETTIGT (zwei Kanten) oder das andere Ende seines Wegstücks. start und ziel beginnen
+    als Enden einer gedachten Kante, ein Weg ist fertig, wenn dieses Stück zum Kreis geschlossen
+    wird. Laufzeit und Speicher wachsen exponentiell nur in der Breite, linear in der Höhe.
+    Die Zahl der bearbeiteten Zustände wird zu stats["knoten"] addiert.
+
+    >>> offen = [[True, True, True], [True, False, True], [True, True, True]]
+    >>> zaehleWegeFront(offen, (0, 0), (2, 2))
+    2
+    >>> zaehleWegeFront([[True] * 3 for _ in range(3)], (0, 0), (2, 2))
+    12
+    """
+    hoehe, breite = len(offen), len(offen[0])
+    s, t = start[0] * breite + start[1], ziel[0] * breite + ziel[1]
+    offen = sackgassenFuellen(offen, start, ziel)
+
+    kanten: list[tuple[int, int]] = []
+    for z in range(hoehe):
+        for sp in range(breite):
+            if offen[z][sp]:
+                if sp + 1 < breite and offen[z][sp + 1]:
+                    kanten.append((z * breite + sp, z * breite + sp + 1))
+                if z + 1 < hoehe and offen[z + 1][sp]:
+                    kanten.append((z * breite + sp, (z + 1) * breite + sp))
+
+    letzteKante: dict[int, int] = {}
+    for k, (u, w) in enumerate(kanten):
+        letzteKante[u] = letzteKante[w] = k
+    if s not in letzteKante or t not in letzteKante:
+        return 0
+
+    front: list[int] = [s, t]
+    zustaende: dict[tuple[int, ...], int] = {(t, s): 1}
+    wege: int = 0
+    knoten: int = 0
+
+    for k, (u, w) in enumerate(kanten):
+        # Neue Felder kommen ohne Kante an die Front
+        neu = [v for v in (u, w) if v not in front]
+        if neu:
+            front = front + neu
+            zustaende = {zustand + tuple(neu): anzahl for zustand, anzahl in zustaende.items()}
+        position = {v: i for i, v in enumerate(front)}
+        pu, pw = position[u], position[w]
+        knoten += len(zustaende)
+
+        naechste: dict[tuple[int, ...], int] = defaultdict(int)
+        for zustand, anzahl in zustaende.items():
+            # Kante nicht verwenden
+            naechste[zustand] += anzahl
+
+            # Kante verwenden
+            a, b = zustand[pu], zustand[pw]
+            if a == GESAETTIGT or b == GESAETTIGT:
+                continue
+            if a == w:
+                # u und w sind die Enden desselben Stücks: nur erlaubt, wenn damit der Weg fertig ist
+                if all(m == v or m == GESAETTIGT for v, m in zip(front, zustand) if v != u and v != w):
+                    wege += anzahl
+                continue
+            mates = list(zustand)
+            if a != u:
+                mates[pu] = GESAETTIGT
+            if b != w:
+                mates[pw] = GESAETTIGT
+            mates[position[a]] = b
+            mates[position[b]] = a
+            naechste[tuple(mates)] += anzahl
+
+        # Felder ohne weitere Kanten verlassen die Front, offene Wegenden dürfen nicht zurückbleiben
+        weg = [i for i, v in enumerate(front) if letzteKante[v] == k]
+        if weg:
+            bleibt = [i for i in range(len(front)) if letzteKante[front[i]] != k]
+            zustaende = defaultdict(int)
+            for zustand, anzahl in naechste.items():
+                if all(zustand[i] == front[i] or zustand[i] == GESAETTIGT for i in weg):
+                    zustaende[tuple(zustand[i] for i in bleibt)] += anzahl
+            front = [front[i] for i in bleibt]
+        else:
+            zustaende = naechste
+
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + knoten
+    return wege
+
+
+def alleSuchenFront(zeile: int, spalte: int, raster: Raster, print: bool = False, delay: int = 500,
+                    loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None) -> int:
+    """
+    Zählt wie alleSuchen alle Wege zu einem Ausgang, mit der frontier-basierten Suche.
+
+    Da ein Weg beim ersten Ausgang endet, wird für jeden Ausgang einzeln gezählt, während die
+    anderen Ausgänge als Wand gelten. Ist das Labyrinth breiter als hoch, wird es transponiert,
+    damit die Front möglichst schmal bleibt. print, delay und loesung werden ignoriert.
+
+    >>> alleSuchenFront(1, 1, Raster.ausDatei("l1.txt"))
+    2
+    """
+    daten = raster.daten
+    start = raster.index(zeile, spalte)
+    if daten[start] == AUSGANG:
+        return 1
+    if daten[start] == WAND or daten[start] == BESUCHT:
+        return 0
+
+    zeilen = [[daten[raster.index(z, s)] for s in range(raster.breite)] for z in range(raster.hoehe)]
+    ausgaenge = [(z, s) for z in range(raster.hoehe) for s in range(raster.breite) if zeilen[z][s] == AUSGANG]
+    if raster.breite > raster.hoehe:
+        zeilen = [list(spalte) for spalte in zip(*zeilen)]
+        ausgaenge = [(s, z) for z, s in ausgaenge]
+        zeile, spalte = spalte, zeile
+
+    offen = [[feld != WAND and feld != BESUCHT and feld != AUSGANG for feld in reihe] for reihe in zeilen]
+    wege: int = 0
+    for z, s in ausgaenge:
+        offen[z][s] = True
+        wege += zaehleWegeFront(offen, (zeile, spalte), (z, s), stats)
+        offen[z][s] = False
+    return wege
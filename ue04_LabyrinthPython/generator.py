@@ -0,0 +1,68 @@
+__author__ = "Hanno Postl"
+__version__ = "1.1"
+__status__ = "Finished"
+
+import random
+from argparse import ArgumentParser
+
+
+def erzeugeLabyrinth(hoehe: int, breite: int, seed: int = 0, braid: float = 0.0) -> list[str]:
+    """
+    Erzeugt ein perfektes Labyrinth (genau ein Weg zwischen zwei Feldern) mit dem Recursive-Backtracker-Verfahren.
+
+    Das Verfahren läuft mit einem expliziten Stack, damit auch sehr große Labyrinthe möglich sind.
+    Gerade Maße werden auf die nächste ungerade Zahl erhöht. Der Start (1, 1) ist immer frei,
+    der Ausgang 'A' liegt am unteren Rand.
+
+    Mit braid > 0 wird danach jede Sackgasse mit dieser Wahrscheinlichkeit zu einem Nachbarfeld
+    durchbrochen. Dadurch entstehen Schleifen und die Zahl der Wege steigt stark an.
+    Gleiche Parameter ergeben immer dasselbe Labyrinth.
+
+    >>> erzeugeLabyrinth(5, 7, seed=1)
+    ['#######', '#     #', '##### #', '#     #', '#####A#']
+    >>> erzeugeLabyrinth(5, 7, seed=1, braid=1.0)
+    ['#######', '#     #', '# ### #', '#     #', '#####A#']
+    """
+    hoehe, breite = hoehe | 1, breite | 1
+    felder: list[list[str]] = [['#'] * breite for _ in range(hoehe)]
+    rng = random.Random(seed)
+
+    felder[1][1] = ' '
+    stack: list[tuple[int, int]] = [(1, 1)]
+    while stack:
+        zeile, spalte = stack[-1]
+        nachbarn = [(zeile + dz, spalte + ds) for dz, ds in ((0, 2), (2, 0), (0, -2), (-2, 0))
+                    if 0 < zeile + dz < hoehe - 1 and 0 < spalte + ds < breite - 1
+                    and felder[zeile + dz][spalte + ds] == '#']
+        if not nachbarn:
+            stack.pop()
+            continue
+        z, s = rng.choice(nachbarn)
+        felder[(zeile + z) // 2][(spalte + s) // 2] = ' '
+        felder[z][s] = ' '
+        stack.append((z, s))
+
+    if braid > 0:
+        for zeile in range(1, hoehe - 1, 2):
+            for spalte in range(1, breite - 1, 2):
+                richtungen = ((0, 1), (1, 0), (0, -1), (-1, 0))
+                offen = sum(felder[zeile + dz][spalte + ds] == ' ' for dz, ds in richtungen)
+                waende = [(dz, ds) for dz, ds in richtungen
+                          if 0 < zeile + 2 * dz < hoehe - 1 and 0 < spalte + 2 * ds < breite - 1
+                          and felder[zeile + dz][spalte + ds] == '#']
+                if offen == 1 and waende and rng.random() < braid:
+                    dz, ds = rng.choice(waende)
+                    felder[zeile + dz][spalte + ds] = ' '
+
+    felder[hoehe - 1][breite - 2] = 'A'
+    return ["".join(zeile) for zeile in felder]
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="generate a labyrinth file")
+    parser.add_argument("hoehe", type=int, help="number of rows")
+    parser.add_argument("breite", type=int, help="number of columns")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the random generator")
+    parser.add_argument("-b", "--braid", type=float, default=0.0, help="probability to open up a dead end (adds loops)")
+    args = parser.parse_args()
+    print("\n".join(erzeugeLabyrinth(args.hoehe, args.breite, args.seed, args.braid)))
@@ -0,0 +1,118 @@
+__author__ = "Hanno Postl"
+__version__ = "1.3"
+__status__ = "Finished"
+
+from typing import Callable, Optional
+
+from raster import AUSGANG, BESUCHT, WAND, Raster
+
+
+class Kreuzungsgraph:
+    """
+    Das Labyrinth zusammengezogen auf seine Kreuzungen.
+
+    Knoten sind der Start, alle Ausgänge und alle Felder mit mindestens drei offenen
+    Nachbarn. Jeder Gang ohne Abzweigung zwischen zwei Knoten wird zu einer Kante; parallele
+    Gänge bleiben als mehrfache Kanten erhalten, Sackgassen und Schleifen zurück zum selben
+    Knoten fallen weg, weil sie in keinem Weg ohne Wiederholung vorkommen können.
+    Jeder Weg im Labyrinth entspricht damit genau einem Weg im Graphen.
+
+    >>> raster = Raster.ausStrings(["#######", "#     #", "# ### #", "#     #", "###A###"])
+    >>> graph = Kreuzungsgraph(raster, raster.index(1, 1))
+    >>> len(graph.knoten), graph.zaehleWege()
+    (3, 2)
+    """
+
+    def __init__(self, raster: Raster, start: int) -> None:
+        self.knoten: list[int] = [start]
+        self.ausgang: list[bool] = [raster.daten[start] == AUSGANG]
+        self.kanten: list[list[int]] = [[]]
+        self.schritte: int = 0
+
+        daten = raster.daten
+        versaetze = raster.versaetze
+
+        knotenNummer: dict[int, int] = {start: 0}
+        offeneKnoten: list[int] = [0] if not self.ausgang[0] else []
+        while offeneKnoten:
+            knoten = offeneKnoten.pop()
+            feld = self.knoten[knoten]
+            for versatz in versaetze:
+                vorher, aktuell = feld, feld + versatz
+                if daten[aktuell] == WAND or daten[aktuell] == BESUCHT:
+                    continue
+                # Dem Gang folgen, bis ein Knoten, eine Kreuzung oder eine Sackgasse erreicht ist
+                sackgasse: bool = False
+                while aktuell not in knotenNummer and daten[aktuell] != AUSGANG:
+                    weiter = [aktuell + v for v in versaetze
+                              if aktuell + v != vorher and daten[aktuell + v] != WAND and daten[aktuell + v] != BESUCHT]
+                    if len(weiter) != 1:
+                        sackgasse = not weiter
+                        break
+                    vorher, aktuell = aktuell, weiter[0]
+                if sackgasse or aktuell == feld:
+                    continue
+                if aktuell not in knotenNummer:
+                    knotenNummer[aktuell] = len(self.knoten)
+                    self.knoten.append(aktuell)
+                    self.ausgang.append(daten[aktuell] == AUSGANG)
+                    self.kanten.append([])
+                    if daten[aktuell] != AUSGANG:
+                        offeneKnoten.append(knotenNummer[aktuell])
+                self.kanten[knoten].append(knotenNummer[aktuell])
+
+    def zaehleWege(self) -> int:
+        """
+        Zählt alle Wege vom Start (Knoten 0) zu einem Ausgang.
+
+        Die besuchten Knoten stehen als Bits in einer einzigen Zahl, der Stack enthält pro
+        Knoten des aktuellen Weges einen Iterator über die noch nicht probierten Kanten.
+        """
+        if self.ausgang[0]:
+            return 1
+
+        ausgang = self.ausgang
+        kanten = self.kanten
+        besucht: int = 1
+        weg: list[int] = [0]
+        richtungen = [iter(kanten[0])]
+        hits: int = 0
+        schritte: int = 0
+
+        while richtungen:
+            for nachbar in richtungen[-1]:
+                if ausgang[nachbar]:
+                    hits += 1
+                elif not besucht >> nachbar & 1:
+                    besucht |= 1 << nachbar
+                    weg.append(nachbar)
+                    richtungen.append(iter(kanten[nachbar]))
+                    schritte += 1
+                    break
+            else:
+                richtungen.pop()
+                besucht ^= 1 << weg.pop()
+
+        self.schritte = schritte
+        return hits
+
+
+def alleSuchenKreuzungen(zeile: int, spalte: int, raster: Raster, print: bool = False, delay: int = 500,
+                         loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None) -> int:
+    """
+    Zählt wie alleSuchen alle Wege zu einem Ausgang, aber auf dem Kreuzungsgraphen.
+
+    Einzelschritte werden nicht angezeigt, print, delay und loesung werden ignoriert.
+    Die Zahl der besuchten Kreuzungen wird wie bei den anderen Suchen zu stats["knoten"] addiert.
+
+    >>> alleSuchenKreuzungen(1, 1, Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"]))
+    2
+    """
+    start = raster.index(zeile, spalte)
+    if raster.daten[start] == WAND or raster.daten[start] == BESUCHT:
+        return 0
+    graph = Kreuzungsgraph(raster, start)
+    hits = graph.zaehleWege()
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + graph.schritte + 1
+    return hits
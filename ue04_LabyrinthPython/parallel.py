@@ -0,0 +1,176 @@
+__author__ = "Hanno Postl"
+__version__ = "1.3"
+__status__ = "Finished"
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Optional
+
+from raster import AUSGANG, BESUCHT, FREI, WAND, Raster
+
+# Schritte, die ein Prozess an einer Aufgabe arbeitet, bevor er den Rest zurückgibt
+BUDGET: int = 200_000
+
+# Eine Aufgabe ist ein Teilweg samt den noch nicht probierten Nachbarn jedes seiner Felder
+Aufgabe = tuple[tuple[int, ...], tuple[tuple[int, ...], ...]]
+
+_raster: Optional[Raster] = None  # Raster des Arbeitsprozesses, gesetzt von _initialisieren
+
+
+def aufgabe(raster: Raster, weg: tuple[int, ...]) -> Aufgabe:
+    """Aufgabe, alle Wege zu suchen, die mit weg beginnen."""
+    feld = weg[-1]
+    return weg, ((),) * (len(weg) - 1) + (tuple(feld + versatz for versatz in raster.versaetze),)
+
+
+def teilbaum(raster: Raster, arbeit: Aufgabe, budget: int) -> tuple[int, int, Optional[Aufgabe]]:
+    """
+    Arbeitet höchstens budget Schritte an einer Aufgabe und zählt die dabei gefundenen Wege.
+
+    Die Felder des Teilweges gelten als besucht. Ist das Budget verbraucht, bevor die Aufgabe
+    fertig ist, wird der Rest (aktueller Weg und unprobierte Nachbarn auf dem Stack) als neue
+    Aufgabe zurückgegeben, sonst None. Das Raster ist danach unverändert. Die Zahl der Schritte
+    ist die Zahl der neu betretenen Felder, wie stats["knoten"] bei alleSuchenIterativ.
+
+    >>> raster = Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"])
+    >>> teilbaum(raster, aufgabe(raster, (raster.index(1, 1),)), BUDGET)
+    (2, 6, None)
+    >>> hits, schritte, rest = teilbaum(raster, aufgabe(raster, (raster.index(1, 1),)), 2)
+    >>> hits, schritte, len(rest[0])
+    (0, 2, 3)
+    >>> hits + teilbaum(raster, rest, BUDGET)[0]
+    2
+    """
+    daten = raster.daten
+    rechts, unten, links, oben = raster.versaetze
+    weg, offen = arbeit
+
+    for index in weg:
+        daten[index] = BESUCHT
+    stack: list[int] = list(weg)
+    richtungen = [iter(nachbarn) for nachbarn in offen]
+    hits: int = 0
+    schritte: int = 0
+
+    while richtungen and schritte < budget:
+        for nachbar in richtungen[-1]:
+            feld = daten[nachbar]
+            if feld == AUSGANG:
+                hits += 1
+            elif feld != WAND and feld != BESUCHT:
+                daten[nachbar] = BESUCHT
+                stack.append(nachbar)
+                richtungen.append(iter((nachbar + rechts, nachbar + unten, nachbar + links, nachbar + oben)))
+                schritte += 1
+                break
+        else:
+            richtungen.pop()
+            daten[stack.pop()] = FREI
+
+    for index in stack:
+        daten[index] = FREI
+    if not richtungen:
+        return hits, schritte, None
+    return hits, schritte, (tuple(stack), tuple(tuple(nachbarn) for nachbarn in richtungen))
+
+
+def teilen(raster: Raster, arbeit: Aufgabe) -> tuple[int, int, list[Aufgabe]]:
+    """
+    Teilt eine Aufgabe am obersten Feld mit unprobierten Nachbarn, dort hängen die größten Teilbäume.
+
+    Jeder dieser Nachbarn wird eine eigene Aufgabe, die restliche Aufgabe ohne sie bleibt erhalten.
+    Ausgänge werden gleich gezählt, Wände und Felder des Teilweges fallen weg. Jeder abgeteilte
+    Nachbar ist ein neu betretenes Feld und zählt für stats["knoten"], die Restaufgabe nicht.
+
+    >>> raster = Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"])
+    >>> hits, knoten, teile = teilen(raster, aufgabe(raster, (raster.index(1, 1),)))
+    >>> hits, knoten, sorted(raster.koordinaten(weg[-1]) for weg, offen in teile)
+    (0, 2, [(1, 2), (2, 1)])
+    """
+    daten = raster.daten
+    weg, offen = arbeit
+    ebene = next((i for i, nachbarn in enumerate(offen) if nachbarn), None)
+    if ebene is None:
+        return 0, 0, []
+
+    hits: int = 0
+    teile: list[Aufgabe] = []
+    prefix = weg[:ebene + 1]
+    for nachbar in offen[ebene]:
+        if daten[nachbar] == AUSGANG:
+            hits += 1
+        elif daten[nachbar] != WAND and daten[nachbar] != BESUCHT and nachbar not in prefix:
+            teile.append(aufgabe(raster, prefix + (nachbar,)))
+    knoten = len(teile)
+    if any(offen[ebene + 1:]):
+        teile.append((weg, offen[:ebene] + ((),) + offen[ebene + 1:]))
+    return hits, knoten, teile
+
+
+def _initialisieren(raster: Raster) -> None:
+    global _raster
+    _raster = raster
+
+
+def _arbeiten(arbeit: Aufgabe, budget: int) -> tuple[int, int, Optional[Aufgabe]]:
+    return teilbaum(_raster, arbeit, budget)
+
+
+def alleSuchenParallel(zeile: int, spalte: int, raster: Raster, print: bool = False, delay: int = 500,
+                       loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None,
+                       prozesse: Optional[int] = None, budget: int = BUDGET) -> int:
+    """
+    Zählt wie alleSuchen alle Wege zu einem Ausgang, verteilt auf mehrere Prozesse.
+
+    Der Suchbaum wird zuerst im Hauptprozess in einige unabhängige Aufgaben geteilt. Jeder Prozess
+    bekommt das Raster einmal über den Initializer und danach nur noch Aufgaben. Nach budget
+    Schritten gibt er den Rest seiner Aufgabe zurück; warten keine weiteren Aufgaben, wird dieser
+    Rest geteilt, damit kein Prozess leer läuft, sonst unverändert wieder eingereiht. So verteilen
+    sich auch sehr ungleich große Teilbäume auf alle Kerne. Die Schritte aller Aufgaben werden wie
+    bei den anderen Suchen zu stats["knoten"] addiert. print, delay und loesung werden ignoriert.
+
+    >>> raster = Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"])
+    >>> stats = {}
+    >>> alleSuchenParallel(1, 1, raster, stats=stats, prozesse=2), stats
+    (2, {'knoten': 7})
+    """
+    prozesse = prozesse or os.cpu_count() or 1
+    start = raster.index(zeile, spalte)
+    if raster.daten[start] == AUSGANG:
+        return 1
+    if raster.daten[start] == WAND or raster.daten[start] == BESUCHT:
+        return 0
+
+    hits: int = 0
+    knoten: int = 1
+    warteschlange: deque[Aufgabe] = deque([aufgabe(raster, (start,))])
+    while warteschlange and len(warteschlange) < 4 * prozesse:
+        teilhits, teilknoten, teile = teilen(raster, warteschlange.popleft())
+        hits += teilhits
+        knoten += teilknoten
+        warteschlange.extend(teile)
+
+    with ProcessPoolExecutor(prozesse, initializer=_initialisieren, initargs=(raster,)) as pool:
+        laufend = set()
+        while warteschlange or laufend:
+            while warteschlange and len(laufend) < 2 * prozesse:
+                laufend.add(pool.submit(_arbeiten, warteschlange.popleft(), budget))
+            fertig, laufend = wait(laufend, return_when=FIRST_COMPLETED)
+            for future in fertig:
+                teilhits, schritte, rest = future.result()
+                hits += teilhits
+                knoten += schritte
+                if rest is None:
+                    continue
+                if len(warteschlange) + len(laufend) < 2 * prozesse:
+                    teilhits, teilknoten, teile = teilen(raster, rest)
+                    hits += teilhits
+                    knoten += teilknoten
+                    warteschlange.extend(teile)
+                else:
+                    warteschlange.append(rest)
+
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + knoten
+    return hits
@@ -0,0 +1,170 @@
+__author__ = "Hanno Postl"
+__version__ = "1.3"
+__status__ = "Finished"
+
+from time import sleep
+from typing import Callable, Optional
+
+WAND: int = ord('#')
+BESUCHT: int = ord('.')
+AUSGANG: int = ord('A')
+FREI: int = ord(' ')
+
+
+class Raster:
+    """
+    Labyrinth als ein einziger bytearray-Puffer (ein Byte pro Feld) statt list[list[int]].
+
+    Um das Labyrinth liegt ein zusätzlicher Rand aus Wänden, dadurch braucht die Suche
+    keine Grenzprüfungen. Ein Feld wird über seinen Index im Puffer angesprochen, die
+    Nachbarn liegen bei index + versatz für die vier Versätze in RICHTUNGEN-Reihenfolge
+    (rechts, unten, links, oben).
+
+    >>> raster = Raster.ausStrings(["###", "# A", "###"])
+    >>> raster.daten[raster.index(1, 2)] == AUSGANG
+    True
+    >>> raster.koordinaten(raster.index(1, 2))
+    (1, 2)
+    >>> str(raster)
+    '###\\n# A\\n###'
+    """
+
+    def __init__(self, zeilen: list[bytes]) -> None:
+        self.hoehe: int = len(zeilen)
+        self.breite: int = max((len(zeile) for zeile in zeilen), default=0)
+        self.stride: int = self.breite + 2
+        rand = bytes([WAND]) * self.stride
+        self.daten: bytearray = bytearray(rand)
+        for zeile in zeilen:
+            self.daten += bytes([WAND]) + zeile.ljust(self.breite, b'#') + bytes([WAND])
+        self.daten += rand
+        self.versaetze: tuple[int, int, int, int] = (1, self.stride, -1, -self.stride)
+
+    @classmethod
+    def ausStrings(cls, strings: list[str]) -> "Raster":
+        return cls([line.strip().encode("ascii") for line in strings])
+
+    @classmethod
+    def ausDatei(cls, path: str) -> "Raster":
+        with open(path, "r") as file:
+            return cls.ausStrings(file.readlines())
+
+    @classmethod
+    def ausLab(cls, lab: list[list[int]]) -> "Raster":
+        return cls([bytes(zeile) for zeile in lab])
+
+    def index(self, zeile: int, spalte: int) -> int:
+        """Index des Feldes (zeile, spalte) im Puffer."""
+        return (zeile + 1) * self.stride + spalte + 1
+
+    def koordinaten(self, index: int) -> tuple[int, int]:
+        """(zeile, spalte) des Feldes mit dem gegebenen Index."""
+        zeile, spalte = divmod(index, self.stride)
+        return zeile - 1, spalte - 1
+
+    def zeilen(self) -> list[str]:
+        """Die Zeilen des Labyrinths ohne den zusätzlichen Rand."""
+        return [self.daten[self.index(z, 0):self.index(z, self.breite)].decode("ascii") for z in range(self.hoehe)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.zeilen())
+
+
+def printRaster(raster: Raster):
+    print(raster)
+
+
+def alleSuchenRaster(zeile: int, spalte: int, raster: Raster, print: bool = False, delay: int = 500,
+                     loesung: Optional[Callable[[], None]] = None, stats: Optional[dict[str, int]] = None) -> int:
+    """
+    Zählt wie alleSuchen alle Wege zu einem Ausgang, direkt auf dem flachen Raster.
+
+    Iterativ wie alleSuchenIterativ, aber jedes Feld ist nur ein Index und jeder Nachbar
+    ein Index plus Versatz, ohne ord()-Aufrufe und ohne zweistufige Indizierung.
+
+    >>> alleSuchenRaster(1, 1, Raster.ausStrings(["#####", "#   #", "# # #", "#  A#", "#####"]))
+    2
+    """
+    daten = raster.daten
+    rechts, unten, links, oben = raster.versaetze
+    start = raster.index(zeile, spalte)
+    feld = daten[start]
+    if feld == AUSGANG:
+        return 1
+    if feld == WAND or feld == BESUCHT:
+        return 0
+
+    daten[start] = BESUCHT
+    weg: list[int] = [start]
+    richtungen = [iter((start + rechts, start + unten, start + links, start + oben))]
+    hits: int = 0
+    knoten: int = 1
+
+    while richtungen:
+        for nachbar in richtungen[-1]:
+            feld = daten[nachbar]
+            if feld == AUSGANG:
+                hits += 1
+                if loesung:
+                    loesung()
+            elif feld != WAND and feld != BESUCHT:
+                daten[nachbar] = BESUCHT
+                weg.append(nachbar)
+                richtungen.append(iter((nachbar + rechts, nachbar + unten, nachbar + links, nachbar + oben)))
+                knoten += 1
+                if print:
+                    printRaster(raster)
+                    sleep(delay / 1000)
+                break
+        else:
+            richtungen.pop()
+            daten[weg.pop()] = FREI
+
+    if stats is not None:
+        stats["knoten"] = stats.get("knoten", 0) + knoten
+    return hits
+
+
+def suchenRaster(zeile: int, spalte: int, raster: Raster, print: bool = False, delay: int = 1) -> bool:
+    """
+    Prüft wie suchen, ob es einen Weg zu einem Ausgang gibt, direkt auf dem flachen Raster.
+
+    >>> suchenRaster(1, 1, Raster.ausStrings(["#####", "#   #", "#####", "#  A#", "#####"]))
+    False
+    """
+    daten = raster.daten
+    rechts, unten, links, oben = raster.versaetze
+    start = raster.index(zeile, spalte)
+    feld = daten[start]
+    if feld == AUSGANG:
+        return True
+    if feld == WAND or feld == BESUCHT:
+        return False
+
+    daten[start] = BESUCHT
+    weg: list[int] = [start]
+    richtungen = [iter((start + rechts, start + unten, start + links, start + oben))]
+    hit: bool = False
+
+    while richtungen and not hit:
+        for nachbar in richtungen[-1]:
+            feld = daten[nachbar]
+            if feld == AUSGANG:
+                hit = True
+                break
+            elif feld != WAND and feld != BESUCHT:
+                daten[nachbar] = BESUCHT
+                weg.append(nachbar)
+                richtungen.append(iter((nachbar + rechts, nachbar + unten, nachbar + links, nachbar + oben)))
+                if print:
+                    printRaster(raster)
+                    sleep(delay / 1000)
+                break
+        else:
+            richtungen.pop()
+            daten[weg.pop()] = FREI
+
+    for index in weg:
+        daten[index] = FREI
+
+    return hit